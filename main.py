@@ -14,28 +14,15 @@ Usage:
 Author: NEPSE CLI Team
 """
 
+import logging
 import shlex
+import sys
+from importlib import import_module
 from prompt_toolkit.patch_stdout import patch_stdout
 from prompt_toolkit.formatted_text import FormattedText
 
 # Import utilities
-from nepse.utils.browser import ensure_playwright_browsers
-
-# Import core functionality
-from nepse.core.auth import test_login_for_member
-from nepse.core.portfolio import get_portfolio_for_member
-from nepse.core.ipo import apply_ipo, apply_ipo_for_all_members
-
-# Import services
-from nepse.services.market import (
-    cmd_ipo,
-    cmd_nepse,
-    cmd_subidx,
-    cmd_mktsum,
-    cmd_topgl,
-    cmd_stonk,
-    get_dp_list
-)
+from nepse.config import ERROR_LOG_FILE
 
 # Import UI components
 from nepse.ui.console import print_logo
@@ -53,15 +40,45 @@ from nepse.ui.cli import (
     execute_interactive_command,
     display_command_palette,
     COMMAND_CATEGORY_ORDER,
+    EXIT_COMMANDS,
     LEGACY_SHORTCUTS
 )
 
 
+logger = logging.getLogger("nepse")
+
+
+def _log_exception(message: str) -> None:
+    """Write the active exception's traceback to the error log file only."""
+    if not logger.handlers:
+        handler = logging.FileHandler(ERROR_LOG_FILE, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.exception(message)
+
+
+def _release_playwright_loop() -> None:
+    """Let prompt_toolkit run again after a command that used the browser."""
+    auth = sys.modules.get("nepse.core.auth")
+    if auth is not None:
+        auth.release_event_loop()
+
+
+def _lazy(module: str, name: str):
+    """
+    Return a stand-in for module.name that imports it on first call.
+    
+    The core and service modules pull in playwright, lxml, cloudscraper and
+    tenacity, none of which are needed to draw the prompt.
+    """
+    def call(*args, **kwargs):
+        return getattr(import_module(module), name)(*args, **kwargs)
+    return call
+
+
 def main():
     """Main entry point for the NEPSE CLI."""
-    # Ensure Playwright browsers are available
-    ensure_playwright_browsers()
-    
     # Get command metadata and create session
     command_metadata = get_command_metadata()
     session = create_prompt_session(command_metadata)
@@ -73,8 +90,8 @@ def main():
     # Build execution context with all function references
     context = {
         # IPO functions
-        'apply_ipo': apply_ipo,
-        'apply_all': apply_ipo_for_all_members,
+        'apply_ipo': _lazy('nepse.core.ipo', 'apply_ipo'),
+        'apply_all': _lazy('nepse.core.ipo', 'apply_ipo_for_all_members'),
         
         # Member management
         'add_member': add_family_member,
@@ -85,17 +102,17 @@ def main():
         'select_member': select_family_member,
         
         # Core operations
-        'portfolio': get_portfolio_for_member,
-        'login': test_login_for_member,
+        'portfolio': _lazy('nepse.core.portfolio', 'get_portfolio_for_member'),
+        'login': _lazy('nepse.core.auth', 'test_login_for_member'),
         
         # Market data
-        'dp_list': get_dp_list,
-        'cmd_ipo': cmd_ipo,
-        'cmd_nepse': cmd_nepse,
-        'cmd_subidx': cmd_subidx,
-        'cmd_mktsum': cmd_mktsum,
-        'cmd_topgl': cmd_topgl,
-        'cmd_stonk': cmd_stonk,
+        'dp_list': _lazy('nepse.services.market', 'get_dp_list'),
+        'cmd_ipo': _lazy('nepse.services.market', 'cmd_ipo'),
+        'cmd_nepse': _lazy('nepse.services.market', 'cmd_nepse'),
+        'cmd_subidx': _lazy('nepse.services.market', 'cmd_subidx'),
+        'cmd_mktsum': _lazy('nepse.services.market', 'cmd_mktsum'),
+        'cmd_topgl': _lazy('nepse.services.market', 'cmd_topgl'),
+        'cmd_stonk': _lazy('nepse.services.market', 'cmd_stonk'),
         
         # Metadata
         'metadata': command_metadata,
@@ -129,9 +146,12 @@ def main():
                 display_command_palette(command_metadata, COMMAND_CATEGORY_ORDER, "")
                 continue
 
-        # Parse command
+        # Parse command (shlex is only needed when quoting or escapes are present)
         try:
-            tokens = shlex.split(user_input)
+            if '"' in user_input or "'" in user_input or '\\' in user_input:
+                tokens = shlex.split(user_input)
+            else:
+                tokens = user_input.split()
         except ValueError as exc:
             print(f"✗ Unable to parse input: {exc}")
             continue
@@ -139,12 +159,16 @@ def main():
         if not tokens:
             continue
 
-        # Resolve legacy shortcuts
-        command = LEGACY_SHORTCUTS.get(tokens[0], tokens[0])
+        # Resolve legacy shortcuts (all of them are "0".."13")
+        first = tokens[0]
+        if len(first) <= 2 and first.isdigit():
+            command = LEGACY_SHORTCUTS.get(first, first)
+        else:
+            command = first
         args = tokens[1:]
 
         # Handle exit
-        if command in {"exit", "quit"}:
+        if command in EXIT_COMMANDS:
             print("Goodbye!")
             break
 
@@ -156,9 +180,17 @@ def main():
         except KeyboardInterrupt:
             print("\n\n✗ Command cancelled")
             continue
+        except (ValueError, FileNotFoundError) as e:
+            # Expected from bad input or missing config; no traceback needed
+            print(f"\n✗ {e}")
+            continue
         except Exception as e:
             print(f"\n✗ Error executing command: {e}")
+            _log_exception(f"Unhandled error in '{user_input}'")
+            print(f"  (details written to {ERROR_LOG_FILE})")
             continue
+        finally:
+            _release_playwright_loop()
 
 
 if __name__ == "__main__":
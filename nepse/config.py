@@ -3,11 +3,23 @@ Configuration management module.
 Handles paths, file operations for config files.
 """
 
+import copy
 import json
 import os
 from pathlib import Path
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+    from rapidfuzz.utils import default_process as fuzz_default_process
+except ImportError:
+    fuzz_process = None
+
 # Dynamic data directory for all credentials
 # Uses user's Documents folder if available, otherwise home directory
 DATA_DIR = Path.home() / "Documents" / "merosharedata"
@@ -19,33 +31,128 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 CONFIG_FILE = DATA_DIR / "family_members.json"
 IPO_CONFIG_FILE = DATA_DIR / "ipo_config.json"
 CLI_HISTORY_FILE = DATA_DIR / "nepse_cli_history.txt"
+CAPITALS_CACHE_FILE = DATA_DIR / "capitals_cache.json"
+PORTFOLIO_CACHE_FILE = DATA_DIR / "portfolio_cache.json"
+ERROR_LOG_FILE = DATA_DIR / "nepse_cli_errors.log"
+PLAYWRIGHT_SENTINEL_FILE = DATA_DIR / ".pw_verified"
+BROWSER_PROFILES_DIR = DATA_DIR / "pw_profiles"
+SESSION_STATES_DIR = DATA_DIR / "pw_sessions"
+
+
+def browser_profile_dir(member_name: str) -> Path:
+    """Per-member Chromium profile dir, so sessions never cross members"""
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in member_name.strip().lower())
+    return BROWSER_PROFILES_DIR / (safe_name or "default")
+
+
+def session_state_file(member_name: str) -> Path:
+    """Saved cookies/localStorage for a member's shared-browser logins"""
+    return SESSION_STATES_DIR / (browser_profile_dir(member_name).name + ".json")
+
+
+def ensure_private_dir(path: Path) -> Path:
+    """Create path (and parents) owner-only, tightening it if it already exists"""
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    try:
+        os.chmod(path, 0o700)
+    except OSError:
+        pass
+    return path
+
+
+def read_json(path: Path):
+    """Parse a JSON file, using orjson when it is installed."""
+    raw = path.read_bytes()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def write_json(path: Path, data) -> None:
+    """Write JSON atomically (temp file + os.replace), owner-only on POSIX."""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+    
+    tmp_path = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+# Parsed family_members.json and its lowercase name -> index map, reused
+# until the file's mtime changes
+_CONFIG_CACHE = {"mtime": None, "data": None, "name_index": {}}
+
+
+def _set_config_cache(config: Dict, mtime: int) -> None:
+    _CONFIG_CACHE["data"] = config
+    _CONFIG_CACHE["name_index"] = {
+        member['name'].lower(): idx for idx, member in enumerate(config.get('members', []))
+    }
+    _CONFIG_CACHE["mtime"] = mtime
+
+
+def _cached_config() -> Optional[Dict]:
+    """The cached config, re-read if the file changed; None if there is no file."""
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    
+    if _CONFIG_CACHE["mtime"] != mtime:
+        _set_config_cache(read_json(CONFIG_FILE), mtime)
+    return _CONFIG_CACHE["data"]
 
 
 def load_family_members() -> Dict:
     """Load all family members from config file"""
-    if not CONFIG_FILE.exists():
+    config = _cached_config()
+    if config is None:
         return {"members": []}
-    
-    with open(CONFIG_FILE, 'r') as f:
-        return json.load(f)
+    # Callers mutate what they get back, so never hand out the cached copy
+    return copy.deepcopy(config)
 
 
 def save_family_members(config: Dict) -> None:
     """Save family members to config file"""
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
-    
-    if os.name != 'nt':
-        os.chmod(CONFIG_FILE, 0o600)
+    # The temp file is created 0600 and os.replace keeps that mode
+    write_json(CONFIG_FILE, config)
+    _set_config_cache(copy.deepcopy(config), CONFIG_FILE.stat().st_mtime_ns)
+
+
+def get_member_index(member_name: str) -> Optional[int]:
+    """Position of a member in config['members'] (case-insensitive), or None"""
+    if _cached_config() is None:
+        return None
+    return _CONFIG_CACHE["name_index"].get(member_name.lower())
 
 
 def get_member_by_name(member_name: str) -> Optional[Dict]:
     """Get a member by name (case-insensitive)"""
-    config = load_family_members()
-    for member in config.get('members', []):
-        if member['name'].lower() == member_name.lower():
-            return member
-    return None
+    idx = get_member_index(member_name)
+    if idx is None:
+        return None
+    return copy.deepcopy(_CONFIG_CACHE["data"]['members'][idx])
+
+
+def suggest_member_names(member_name: str, limit: int = 3) -> List[str]:
+    """Member names close to member_name, best match first (for typos)"""
+    names = [m['name'] for m in load_family_members().get('members', [])]
+    if not names or not member_name:
+        return []
+    if fuzz_process is not None:
+        matches = fuzz_process.extract(
+            member_name, names, scorer=fuzz.WRatio, processor=fuzz_default_process,
+            limit=limit, score_cutoff=60
+        )
+        return [name for name, _, _ in matches]
+    # Only needed without rapidfuzz, so kept off the startup path
+    import difflib
+    # difflib is case-sensitive, so match on lowered names
+    lowered = {name.lower(): name for name in names}
+    matches = difflib.get_close_matches(member_name.lower(), list(lowered), n=limit, cutoff=0.6)
+    return [lowered[name] for name in matches]
 
 
 def get_all_members() -> List[Dict]:
@@ -83,6 +190,10 @@ def delete_member(index: int) -> bool:
     return False
 
 
+# Parsed ipo_config.json, reused until the file's mtime changes
+_IPO_CONFIG_CACHE = {"mtime": None, "data": None}
+
+
 def load_ipo_config() -> Dict:
     """Load IPO application configuration"""
     if not IPO_CONFIG_FILE.exists():
@@ -90,15 +201,24 @@ def load_ipo_config() -> Dict:
             "applied_kitta": 10,
             "crn_number": "YOUR_CRN_NUMBER_HERE"
         }
-        with open(IPO_CONFIG_FILE, 'w') as f:
-            json.dump(default_config, f, indent=2)
+        write_json(IPO_CONFIG_FILE, default_config)
         return default_config
     
-    with open(IPO_CONFIG_FILE, 'r') as f:
-        return json.load(f)
+    mtime = IPO_CONFIG_FILE.stat().st_mtime_ns
+    if _IPO_CONFIG_CACHE["mtime"] != mtime:
+        _IPO_CONFIG_CACHE["data"] = read_json(IPO_CONFIG_FILE)
+        _IPO_CONFIG_CACHE["mtime"] = mtime
+    
+    return copy.deepcopy(_IPO_CONFIG_CACHE["data"])
+
+
+_HISTORY_ENSURED = False
 
 
 def ensure_history_file() -> None:
     """Ensure CLI history file exists"""
-    if not CLI_HISTORY_FILE.exists():
-        CLI_HISTORY_FILE.touch()
+    global _HISTORY_ENSURED
+    if _HISTORY_ENSURED:
+        return
+    CLI_HISTORY_FILE.touch(exist_ok=True)
+    _HISTORY_ENSURED = True
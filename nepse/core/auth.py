@@ -3,11 +3,133 @@ Meroshare Authentication Module.
 Handles all login operations with Playwright browser automation.
 """
 
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import re
+import select
+import sys
 import time
-from typing import Dict, Optional, Tuple
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
+from ..config import browser_profile_dir, ensure_private_dir, session_state_file, write_json
 from ..ui.console import console
+from ..utils.browser import ensure_playwright_browsers
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page, Browser, BrowserContext
+
+
+def _env_slow_mo() -> int:
+    """NEPSE_SLOW_MO in ms; 0 (no delay) when unset or not a positive number."""
+    try:
+        return max(int(os.environ.get("NEPSE_SLOW_MO", "0") or 0), 0)
+    except ValueError:
+        return 0
+
+
+# Per-action delay (ms) for watching a --gui run; debugging only, off by default
+DEBUG_SLOW_MO = _env_slow_mo()
+# Full-page error screenshots are slow on long tables; viewport unless debugging
+DEBUG_FULL_PAGE = os.environ.get("NEPSE_DEBUG", "") == "1"
+
+# One Playwright driver and one browser per (headless, slow_mo) for the whole
+# process, so only the first browser command of a session pays for startup
+_PLAYWRIGHT = None
+_BROWSERS: Dict[Tuple[bool, int], Browser] = {}
+
+# Every sync Playwright call leaves its event loop registered as this
+# thread's running loop, which makes prompt_toolkit's asyncio.run() fail.
+# release_event_loop() parks it here between commands.
+_PARKED_LOOP = None
+
+
+def release_event_loop() -> None:
+    """Detach the pooled driver's loop from this thread so prompts can run."""
+    global _PARKED_LOOP
+    loop = asyncio.events._get_running_loop()
+    if loop is not None:
+        _PARKED_LOOP = loop
+        asyncio.events._set_running_loop(None)
+
+
+def _attach_event_loop() -> None:
+    """Re-register a loop parked by release_event_loop() before using Playwright."""
+    global _PARKED_LOOP
+    if _PARKED_LOOP is not None:
+        if not _PARKED_LOOP.is_closed():
+            asyncio.events._set_running_loop(_PARKED_LOOP)
+        _PARKED_LOOP = None
+
+
+def get_playwright():
+    """Import and start Playwright on first use; reused until exit."""
+    global _PLAYWRIGHT
+    _attach_event_loop()
+    if _PLAYWRIGHT is None:
+        from playwright.sync_api import sync_playwright
+        ensure_playwright_browsers()
+        _PLAYWRIGHT = sync_playwright().start()
+        atexit.register(shutdown_playwright)
+    return _PLAYWRIGHT
+
+
+def get_browser(headless: bool = True, slow_mo: int = 0) -> Browser:
+    """Return the shared Chromium for these launch options, launching it if needed."""
+    _attach_event_loop()
+    key = (headless, slow_mo)
+    browser = _BROWSERS.get(key)
+    if browser is None or not browser.is_connected():
+        browser = get_playwright().chromium.launch(headless=headless, slow_mo=slow_mo)
+        _BROWSERS[key] = browser
+    return browser
+
+
+def shutdown_playwright() -> None:
+    """Close pooled browsers and stop the Playwright driver."""
+    global _PLAYWRIGHT
+    _attach_event_loop()
+    for browser in _BROWSERS.values():
+        try:
+            browser.close()
+        except:
+            pass
+    _BROWSERS.clear()
+    if _PLAYWRIGHT is not None:
+        try:
+            _PLAYWRIGHT.stop()
+        except:
+            pass
+        _PLAYWRIGHT = None
+
+
+# Resource types the automation never looks at. Stylesheets are kept:
+# visibility waits (e.g. the DP dropdown closing) depend on them.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+# Third-party analytics scripts Meroshare pulls in on every page
+BLOCKED_HOSTS = ("google-analytics.com", "googletagmanager.com", "doubleclick.net")
+
+
+def _route_request(route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(host in request.url for host in BLOCKED_HOSTS):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def block_heavy_resources(context: BrowserContext) -> BrowserContext:
+    """Abort image, font, media and analytics requests for every page in context."""
+    context.route("**/*", _route_request)
+    return context
+
+
+# Accessible-name fallbacks for the login fields if Meroshare's markup shifts
+USERNAME_LABEL = re.compile("user", re.IGNORECASE)
+PASSWORD_LABEL = re.compile("password", re.IGNORECASE)
 
 
 class MeroshareAuth:
@@ -17,37 +139,47 @@ class MeroshareAuth:
     """
     
     MEROSHARE_LOGIN_URL = "https://meroshare.cdsc.com.np/#/login"
+    MEROSHARE_DASHBOARD_URL = "https://meroshare.cdsc.com.np/#/dashboard"
     
     # Common selectors for form elements
     SELECTORS = {
+        "dp_select": "select.select2-hidden-accessible",
         "dp_dropdown": "span.select2-selection",
         "dp_results": ".select2-results",
         "dp_search": "input.select2-search__field",
         "dp_option_highlighted": "li.select2-results__option--highlighted, li.select2-results__option[aria-selected='true']",
         "dp_options": "li.select2-results__option",
-        "username": [
-            "input[formcontrolname='username']",
-            "input#username",
+        # Only rendered for a logged-in user
+        "dashboard": (
+            "app-dashboard, "
+            "a:has-text('Logout'), "
+            "button:has-text('Logout')"
+        ),
+        # Comma-joined alternatives: the first matching element wins, so
+        # a miss costs nothing instead of a per-selector timeout
+        "username": (
+            "input[formcontrolname='username'], "
+            "input#username, "
             "input[placeholder*='User']"
-        ],
-        "password": [
-            "input[formcontrolname='password']",
+        ),
+        "password": (
+            "input[formcontrolname='password'], "
             "input[type='password']"
-        ],
-        "login_button": [
-            "button.btn.sign-in",
-            "button[type='submit']",
+        ),
+        "login_button": (
+            "button.btn.sign-in, "
+            "button[type='submit'], "
             "button:has-text('Login')"
-        ]
+        )
     }
     
-    def __init__(self, headless: bool = True, slow_mo: int = 0):
+    def __init__(self, headless: bool = True, slow_mo: int = DEBUG_SLOW_MO):
         """
         Initialize authentication handler.
         
         Args:
             headless: Run browser in headless mode
-            slow_mo: Slow down operations by this many ms
+            slow_mo: Slow down operations by this many ms (NEPSE_SLOW_MO)
         """
         self.headless = headless
         self.slow_mo = slow_mo if not headless else 0
@@ -56,69 +188,194 @@ class MeroshareAuth:
         self.page: Optional[Page] = None
         self.playwright = None
     
-    def _fill_with_fallback(self, selectors: list, value: str, timeout: int = 2000) -> bool:
-        """Try multiple selectors to fill a field."""
-        for selector in selectors:
-            try:
-                self.page.fill(selector, value, timeout=timeout)
-                return True
-            except:
-                continue
-        return False
+    def _fill_with_fallback(self, selector: str, value: str, label=None, timeout: int = 3000) -> bool:
+        """Fill the first field matching the comma-joined selectors (or, if given, the label)."""
+        try:
+            locator = self.page.locator(selector)
+            if label is not None:
+                locator = locator.or_(self.page.get_by_label(label))
+            locator.first.fill(value, timeout=timeout)
+            return True
+        except:
+            return False
     
-    def _click_with_fallback(self, selectors: list, timeout: int = 2000) -> bool:
-        """Try multiple selectors to click an element."""
-        for selector in selectors:
-            try:
-                self.page.click(selector, timeout=timeout)
-                return True
-            except:
-                continue
-        return False
+    def _click_with_fallback(self, selector: str, timeout: int = 3000) -> bool:
+        """Click the first element matching any of the comma-joined selectors."""
+        try:
+            self.page.locator(selector).first.click(timeout=timeout)
+            return True
+        except:
+            return False
+    
+    def _fill_credentials(self, username: str, password: str) -> None:
+        """
+        Fill username and password in one evaluate call.
+        
+        Angular's form controls only pick up values via 'input' events, so
+        those are dispatched after setting each value. Only a field that
+        isn't in the DOM yet falls back to page.fill (which waits for it).
+        
+        Raises:
+            Exception: If a field can't be found at all
+        """
+        fields = [
+            ("username", self.SELECTORS["username"], username, USERNAME_LABEL),
+            ("password", self.SELECTORS["password"], password, PASSWORD_LABEL),
+        ]
+        filled = self.page.evaluate(
+            """(fields) => fields.map(([sel, value]) => {
+                const el = document.querySelector(sel);
+                if (!el) return false;
+                el.value = value;
+                el.dispatchEvent(new Event('input', {bubbles: true}));
+                return true;
+            })""",
+            [[selector, value] for _, selector, value, _ in fields]
+        )
+        for (name, selector, value, label), ok in zip(fields, filled):
+            if not ok and not self._fill_with_fallback(selector, value, label=label):
+                raise Exception(f"{name} field not found on the login page")
+    
+    def _open_login_page(self) -> None:
+        """Load the login page and wait for the DP dropdown to render."""
+        # Meroshare keeps XHRs open, so networkidle would wait out its timeout
+        self.page.goto(self.MEROSHARE_LOGIN_URL, wait_until="domcontentloaded")
+        self.page.wait_for_selector(self.SELECTORS["dp_dropdown"], state="visible", timeout=15000)
+    
+    def _resume_session(self, timeout: int = 10000) -> bool:
+        """
+        Reuse a saved session from the member's browser profile.
+        
+        Opens the dashboard and waits for whichever renders first: the
+        dashboard (session is live) or the login DP dropdown (Meroshare
+        bounced an expired token to the login page, which is left ready
+        for the normal login flow). Neither appearing counts as expired.
+        """
+        try:
+            self.page.goto(self.MEROSHARE_DASHBOARD_URL, wait_until="domcontentloaded")
+            dashboard = self.page.locator(self.SELECTORS["dashboard"])
+            login_form = self.page.locator(self.SELECTORS["dp_dropdown"])
+            dashboard.or_(login_form).first.wait_for(state="visible", timeout=timeout)
+            return dashboard.first.is_visible()
+        except:
+            return False
+    
+    def _wait_for_login(self, timeout: int = 15000) -> bool:
+        """Wait for the app to route away from the login page."""
+        try:
+            self.page.wait_for_url(lambda url: "#/login" not in url.lower(), timeout=timeout)
+            return True
+        except:
+            return False
+    
+    def _click_dp_option_by_text(self, dp_value: str) -> bool:
+        """Click the first DP option containing dp_value, found in one evaluate call."""
+        idx = self.page.evaluate(
+            "([sel, val]) => Array.from(document.querySelectorAll(sel))"
+            ".findIndex(li => li.textContent.includes(val))",
+            [self.SELECTORS["dp_options"], dp_value]
+        )
+        if idx < 0:
+            return False
+        self.page.locator(self.SELECTORS["dp_options"]).nth(idx).click()
+        return True
+    
+    def _select_dp_direct(self, dp_value: str) -> bool:
+        """
+        Pick the DP on the <select> behind Select2 in one evaluate call.
+        
+        Sets the option whose text contains dp_value and fires the change and
+        select2:select events the Angular wrapper listens for. Returns False
+        (leaving the page untouched) if no such option exists.
+        """
+        try:
+            return self.page.evaluate(
+                """([sel, val]) => {
+                    const select = document.querySelector(sel);
+                    if (!select) return false;
+                    const option = Array.from(select.options).find(o => o.textContent.includes(val));
+                    if (!option) return false;
+                    select.value = option.value;
+                    select.dispatchEvent(new Event('change', {bubbles: true}));
+                    if (window.jQuery) {
+                        const $select = window.jQuery(select);
+                        $select.trigger('change');
+                        $select.trigger({type: 'select2:select', params: {data: {id: option.value, text: option.textContent}}});
+                    }
+                    return true;
+                }""",
+                [self.SELECTORS["dp_select"], dp_value]
+            )
+        except:
+            return False
     
     def _select_dp(self, dp_value: str) -> bool:
         """Select DP from dropdown."""
+        if self._select_dp_direct(dp_value):
+            return True
+        
+        # Fall back to driving the Select2 UI like a user would
         try:
-            # Click to open dropdown
+            # Click to open dropdown and wait for results
             self.page.click(self.SELECTORS["dp_dropdown"])
-            time.sleep(1)
-            
-            # Wait for results
             self.page.wait_for_selector(self.SELECTORS["dp_results"], timeout=5000)
             
             # Type in search box
             search_box = self.page.query_selector(self.SELECTORS["dp_search"])
             if search_box:
                 search_box.type(dp_value)
-                time.sleep(0.5)
                 
                 # Click highlighted result or press Enter
-                first_result = self.page.query_selector(self.SELECTORS["dp_option_highlighted"])
+                try:
+                    first_result = self.page.wait_for_selector(self.SELECTORS["dp_option_highlighted"], timeout=3000)
+                except:
+                    first_result = None
                 if first_result:
                     first_result.click()
                 else:
                     self.page.keyboard.press("Enter")
             else:
                 # Fallback: click by text
-                results = self.page.query_selector_all(self.SELECTORS["dp_options"])
-                for result in results:
-                    if dp_value in result.inner_text():
-                        result.click()
-                        break
+                self._click_dp_option_by_text(dp_value)
             
-            time.sleep(1)
+            # The dropdown closes once a DP has been picked
+            self.page.wait_for_selector(self.SELECTORS["dp_results"], state="hidden", timeout=5000)
             return True
         except Exception as e:
             print(f"    ⚠ DP selection error: {e}")
             return False
     
-    def login(self, member: Dict, show_progress: bool = True) -> Tuple[bool, Optional[Page]]:
+    def _login_on_page(self, dp_value: str, username: str, password: str) -> bool:
+        """
+        Run the login form on self.page: DP, credentials, submit.
+        
+        Returns:
+            True once the app has routed away from the login page
+        """
+        if "#/login" not in self.page.url.lower():
+            self._open_login_page()
+        
+        if not self._select_dp(dp_value):
+            return False
+        
+        self._fill_credentials(username, password)
+        self._click_with_fallback(self.SELECTORS["login_button"])
+        
+        return self._wait_for_login()
+    
+    def login(
+        self, 
+        member: Dict, 
+        show_progress: bool = True, 
+        force_login: bool = False
+    ) -> Tuple[bool, Optional[Page]]:
         """
         Perform login for a member.
         
         Args:
             member: Dict with dp_value, username, password keys
             show_progress: Show progress bar during login
+            force_login: Log in again even if the profile holds a live session
             
         Returns:
             Tuple of (success: bool, page: Page or None)
@@ -127,98 +384,41 @@ class MeroshareAuth:
         username = member['username']
         password = member['password']
         
-        # Don't use 'with' - keep browser open for subsequent operations
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=self.headless, slow_mo=self.slow_mo)
-        self.context = self.browser.new_context()
-        self.page = self.context.new_page()
+        # Don't use 'with' - keep browser open for subsequent operations.
+        # A persistent per-member profile keeps Meroshare's session between runs.
+        # It holds live session cookies, so it is owner-only like the config files.
+        profile_dir = browser_profile_dir(member['name'])
+        ensure_private_dir(profile_dir.parent)
+        ensure_private_dir(profile_dir)
+        self.playwright = get_playwright()
+        self.context = block_heavy_resources(self.playwright.chromium.launch_persistent_context(
+            profile_dir,
+            headless=self.headless,
+            slow_mo=self.slow_mo
+        ))
+        self.page = self.context.pages[0] if self.context.pages else self.context.new_page()
         
         try:
+            if not force_login and self._resume_session():
                 if show_progress:
-                    with console.status("[bold green]Logging in to Meroshare...", spinner="dots"):
-                        self.page.goto(self.MEROSHARE_LOGIN_URL, wait_until="networkidle")
-                        time.sleep(1)
-                        
-                        self.page.click(self.SELECTORS["dp_dropdown"])
-                        time.sleep(1)
-                        
-                        self.page.wait_for_selector(self.SELECTORS["dp_results"], timeout=5000)
-                        
-                        search_box = self.page.query_selector(self.SELECTORS["dp_search"])
-                        if search_box:
-                            search_box.type(dp_value)
-                            time.sleep(0.5)
-                            
-                            first_result = self.page.query_selector(self.SELECTORS["dp_option_highlighted"])
-                            if first_result:
-                                first_result.click()
-                            else:
-                                self.page.keyboard.press("Enter")
-                        else:
-                            results = self.page.query_selector_all(self.SELECTORS["dp_options"])
-                            for result in results:
-                                if dp_value in result.inner_text():
-                                    result.click()
-                                    break
-                        
-                        time.sleep(1)
-                        
-                        self._fill_with_fallback(self.SELECTORS["username"], username)
-                        self._fill_with_fallback(self.SELECTORS["password"], password)
-                        self._click_with_fallback(self.SELECTORS["login_button"])
-                        
-                        try:
-                            self.page.wait_for_function(
-                                "window.location.hash !== '#/login'", 
-                                timeout=8000
-                            )
-                            time.sleep(2)
-                        except:
-                            time.sleep(2)
-                else:
-                    # No progress - silent mode
-                    self.page.goto(self.MEROSHARE_LOGIN_URL, wait_until="networkidle")
-                    time.sleep(1)
-                    
-                    if not self._select_dp(dp_value):
-                        return False, None
-                    
-                    self._fill_with_fallback(self.SELECTORS["username"], username)
-                    self._fill_with_fallback(self.SELECTORS["password"], password)
-                    self._click_with_fallback(self.SELECTORS["login_button"])
-                    
-                    try:
-                        self.page.wait_for_function(
-                            "window.location.hash !== '#/login'", 
-                            timeout=8000
-                        )
-                        time.sleep(2)
-                    except:
-                        time.sleep(2)
-                
-                time.sleep(2)
-                
-                # Check if login succeeded
-                try:
-                    self.page.wait_for_function(
-                        "window.location.hash !== '#/login'", 
-                        timeout=3000
-                    )
-                except:
-                    pass
-                
-                current_url = self.page.url
-                success = "#/login" not in current_url.lower()
-                
-                if show_progress and success:
-                    console.print("[bold green]✓ Login successful[/bold green]\n")
-                
-                return success, self.page
-                
+                    console.print("[bold green]✓ Resumed saved Meroshare session[/bold green]\n")
+                return True, self.page
+            
+            if show_progress:
+                with console.status("[bold green]Logging in to Meroshare...", spinner="dots"):
+                    success = self._login_on_page(dp_value, username, password)
+            else:
+                success = self._login_on_page(dp_value, username, password)
+            
+            if show_progress and success:
+                console.print("[bold green]✓ Login successful[/bold green]\n")
+            
+            return success, self.page
+            
         except Exception as e:
-                if show_progress:
-                    console.print(f"[red]✗ Login error: {e}[/red]")
-                return False, None
+            if show_progress:
+                console.print(f"[red]✗ Login error: {e}[/red]")
+            return False, None
     
     def login_with_context(self, member: Dict, context: BrowserContext) -> Tuple[bool, Optional[Page]]:
         """
@@ -238,26 +438,7 @@ class MeroshareAuth:
         self.page = context.new_page()
         
         try:
-            self.page.goto(self.MEROSHARE_LOGIN_URL, wait_until="networkidle")
-            time.sleep(2)
-            
-            if not self._select_dp(dp_value):
-                return False, self.page
-            
-            self._fill_with_fallback(self.SELECTORS["username"], username)
-            self._fill_with_fallback(self.SELECTORS["password"], password)
-            self._click_with_fallback(self.SELECTORS["login_button"])
-            
-            try:
-                self.page.wait_for_function(
-                    "window.location.hash !== '#/login'", 
-                    timeout=8000
-                )
-                time.sleep(2)
-            except:
-                time.sleep(2)
-            
-            success = "#/login" not in self.page.url.lower()
+            success = self._login_on_page(dp_value, username, password)
             return success, self.page
             
         except Exception as e:
@@ -269,37 +450,200 @@ class MeroshareAuth:
         if self.browser:
             self.browser.close()
             self.browser = None
-            self.context = None
-            self.page = None
-        if self.playwright:
-            self.playwright.stop()
-            self.playwright = None
+        elif self.context:
+            # Persistent contexts own their browser; closing them flushes the profile
+            self.context.close()
+        self.context = None
+        self.page = None
+        # The Playwright driver is shared; shutdown_playwright() stops it at exit
+        self.playwright = None
+
+
+class MeroshareSession:
+    """
+    One Playwright browser shared across several member logins.
+    
+    Launching Chromium dominates login time, so bulk operations open a
+    single session and log each member in on a new page. The browser
+    comes from the process-wide pool (unless one is passed in) and
+    outlives the session; only the session's contexts are closed on exit:
+    
+        with MeroshareSession(headless=True) as session:
+            for member in members:
+                success, page = session.login(member)
+    """
+    
+    def __init__(
+        self, 
+        headless: bool = True, 
+        slow_mo: int = DEBUG_SLOW_MO, 
+        browser: Optional[Browser] = None
+    ):
+        """
+        Initialize the session (the browser starts on __enter__).
+        
+        Args:
+            headless: Run browser in headless mode
+            slow_mo: Slow down operations by this many ms (NEPSE_SLOW_MO)
+            browser: Browser to use instead of the pooled one
+        """
+        self.headless = headless
+        self.slow_mo = slow_mo if not headless else 0
+        self.browser: Optional[Browser] = browser
+        self.contexts: List[BrowserContext] = []
+    
+    def __enter__(self) -> "MeroshareSession":
+        if self.browser is None:
+            self.browser = get_browser(self.headless, self.slow_mo)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def new_context(self, storage_state=None) -> BrowserContext:
+        """Create a browser context on the shared browser."""
+        context = block_heavy_resources(self.browser.new_context(storage_state=storage_state))
+        self.contexts.append(context)
+        return context
+    
+    def login(
+        self, 
+        member: Dict, 
+        context: Optional[BrowserContext] = None, 
+        force_login: bool = False
+    ) -> Tuple[bool, Optional[Page]]:
+        """
+        Log a member in on a new page.
+        
+        Without a context, the member gets their own one seeded from the
+        session saved by their last login, and the login form is skipped
+        while that session is still valid.
+        
+        Args:
+            member: Dict with dp_value, username, password keys
+            context: Context to open the page in; a fresh one if omitted
+            force_login: Ignore any saved session
+            
+        Returns:
+            Tuple of (success: bool, page: Page or None)
+        """
+        auth = MeroshareAuth(headless=self.headless)
+        if context is not None:
+            return auth.login_with_context(member, context)
+        
+        state_file = session_state_file(member['name'])
+        saved_state = state_file if state_file.exists() and not force_login else None
+        context = self.new_context(storage_state=saved_state)
+        
+        if saved_state:
+            auth.page = context.new_page()
+            if auth._resume_session():
+                return True, auth.page
+            # Stale session; drop it and log in normally
+            auth.page.close()
+            try:
+                state_file.unlink()
+            except OSError:
+                pass
+        
+        success, page = auth.login_with_context(member, context)
+        if success:
+            try:
+                # Session tokens: owner-only dir and 0600 file, like the config files
+                ensure_private_dir(state_file.parent)
+                write_json(state_file, context.storage_state())
+            except Exception:
+                pass
+        return success, page
+    
+    def close(self) -> None:
+        """Close this session's contexts; the pooled browser stays up."""
+        for context in self.contexts:
+            try:
+                context.close()
+            except:
+                pass
+        self.contexts = []
+        self.browser = None
+
+
+def _enter_pressed() -> bool:
+    """Non-blocking check for a pending Enter on stdin."""
+    if sys.platform == "win32":
+        import msvcrt
+        while msvcrt.kbhit():
+            if msvcrt.getwch() in ("\r", "\n"):
+                return True
+        return False
+    ready, _, _ = select.select([sys.stdin], [], [], 0)
+    if ready:
+        sys.stdin.readline()
+        return True
+    return False
 
 
-def test_login_for_member(member: Dict, headless: bool = True) -> bool:
+def wait_for_browser_close(page: Page, max_seconds: Optional[float] = None) -> None:
+    """
+    Keep the browser up until the user is done with it.
+    
+    Returns when the page is closed, Enter is pressed, or max_seconds
+    (if given) pass. Playwright only processes the close event while it is
+    being called, so the page is polled in short wait_for_timeout slices.
+    """
+    console.print("\n[dim]Press Enter or close the browser window when you're done...[/dim]")
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    try:
+        while not page.is_closed():
+            if _enter_pressed():
+                break
+            if deadline and time.monotonic() >= deadline:
+                break
+            page.wait_for_timeout(200)
+    except Exception:
+        pass
+
+
+def test_login_for_member(member: Dict, headless: bool = True, keep_open: bool = False) -> bool:
     """
     Test login for a specific family member.
     
+    Headless checks go straight to the Meroshare API; a browser is only
+    launched when the login should be watched (--gui).
+    
     Args:
         member: Member dictionary with credentials
-        headless: Run browser in headless mode
+        headless: Check via the API instead of a visible browser
+        keep_open: With a visible browser, wait for the user to close it
         
     Returns:
         True if login successful, False otherwise
     """
     console.print(f"\n[bold cyan]Testing login for:[/bold cyan] [bold white]{member['name']}[/bold white]...\n")
     
-    auth = MeroshareAuth(headless=headless, slow_mo=100)
-    success, page = auth.login(member, show_progress=True)
+    auth = None
+    page = None
+    if headless:
+        # Checking credentials doesn't need a browser; the API answers directly
+        from .portfolio import api_login
+        try:
+            api_login(member)
+            success = True
+        except Exception as e:
+            console.print(f"[red]✗ Login error: {e}[/red]")
+            success = False
+    else:
+        auth = MeroshareAuth(headless=headless)
+        # A test should exercise the credentials, not a saved session
+        success, page = auth.login(member, show_progress=True, force_login=True)
     
     if success:
         console.print(f"[bold green]✓✓✓ LOGIN SUCCESSFUL for {member['name']}! ✓✓✓[/bold green]\n")
     else:
         console.print(f"[yellow]⚠ Login may have failed for {member['name']}[/yellow]\n")
     
-    if not headless and page:
-        console.print("[dim]Browser will stay open for 20 seconds...[/dim]")
-        time.sleep(20)
+    if keep_open and page:
+        wait_for_browser_close(page)
     
-    auth.close()
+    if auth:
+        auth.close()
     return success
@@ -3,22 +3,108 @@ IPO Application Module.
 Handles IPO listing, application, and batch processing.
 """
 
-import time
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
-from playwright.sync_api import sync_playwright, Page, BrowserContext
+from playwright.sync_api import Page, Browser, BrowserContext
 
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.rule import Rule
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
 from rich import box
 
-from .auth import MeroshareAuth
+from .auth import MeroshareAuth, MeroshareSession, wait_for_browser_close, DEBUG_FULL_PAGE
 from ..config import DATA_DIR
 
 console = Console(force_terminal=True, legacy_windows=False)
 
 
+# Text of the ".form-value span" in the .form-group labelled 'Minimum Quantity'
+_MIN_QUANTITY_JS = """() => {
+    const label = Array.from(document.querySelectorAll('label'))
+        .find(l => l.innerText.includes('Minimum Quantity'));
+    const group = label ? label.closest('.form-group') : null;
+    const value = group ? group.querySelector('.form-value span') : null;
+    return value ? value.innerText.trim() : null;
+}"""
+
+
+def _read_min_quantity(page: Page) -> Optional[int]:
+    """Read the 'Minimum Quantity' shown on the application form, if any."""
+    # One evaluate for label search and value lookup, not a call per label
+    text = page.evaluate(_MIN_QUANTITY_JS)
+    return int(text) if text else None
+
+
+# Listing filter: ordinary-share IPOs only (case-insensitive)
+_IPO_RE = re.compile(r"ipo", re.I)
+_ORDINARY_RE = re.compile(r"ordinary", re.I)
+
+
+# Every .company-list row on the ASBA page as plain data; null marks a missing element
+_COMPANY_ROWS_JS = """() => Array.from(document.querySelectorAll('.company-list')).map(row => {
+    const text = sel => { const el = row.querySelector(sel); return el ? el.innerText.trim() : null; };
+    const button = row.querySelector('button.btn-issue');
+    return {
+        company_name: text('.company-name span'),
+        share_type: text('.share-of-type'),
+        share_group: text('.isin'),
+        button_text: button ? button.innerText.trim().toLowerCase() : null
+    };
+})"""
+
+
+def _wait_for_options(page: Page, select_selector: str, timeout: int = 10000) -> None:
+    """Wait until a <select> has at least one real (non-placeholder) option."""
+    page.wait_for_function(
+        "sel => Array.from(document.querySelectorAll(sel + ' option')).some(o => o.value)",
+        arg=select_selector,
+        timeout=timeout
+    )
+
+
+def _first_option_value(page: Page, select_selector: str) -> Optional[str]:
+    """Value of a <select>'s first real option, read in one evaluate call."""
+    return page.evaluate(
+        "sel => { const s = document.querySelector(sel); "
+        "const o = s ? Array.from(s.options).find(o => o.value) : null; return o ? o.value : null; }",
+        select_selector
+    )
+
+
+def _wait_for_submission(page: Page, timeout: int = 15000) -> None:
+    """Wait for Meroshare to leave the PIN screen after submitting."""
+    try:
+        page.wait_for_selector("input#transactionPIN", state="detached", timeout=timeout)
+    except:
+        pass
+
+
+# Last-resort click on the PIN screen's submit button from inside the page
+_CLICK_APPLY_JS = """() => {
+    const btn = Array.from(document.querySelectorAll('button'))
+        .find(b => b.textContent.includes('Apply') && b.type === 'submit');
+    if (btn) btn.click();
+    return !!btn;
+}"""
+
+
+def _click_submit_button(page: Page) -> bool:
+    """Click the Apply button on the PIN screen; click() waits until it is actionable."""
+    try:
+        page.locator("button[type='submit']:has-text('Apply'):visible").first.click(timeout=15000)
+        return True
+    except:
+        return page.evaluate(_CLICK_APPLY_JS)
+
+
+def _read_company_rows(page: Page) -> List[Dict]:
+    """Read the ASBA company list in one evaluate call instead of per-cell round-trips."""
+    return page.evaluate(_COMPANY_ROWS_JS)
+
+
 class IPOManager:
     """Handles IPO browsing and application operations."""
     
@@ -41,53 +127,38 @@ class IPOManager:
             List of available IPO dictionaries
         """
         try:
-            self.page.goto(self.ASBA_URL, wait_until="networkidle")
-            time.sleep(3)
+            self.page.goto(self.ASBA_URL, wait_until="domcontentloaded")
             
             try:
                 self.page.wait_for_selector(".company-list", timeout=10000)
-                time.sleep(2)
             except:
                 pass
             
-            company_rows = self.page.query_selector_all(".company-list")
+            company_rows = _read_company_rows(self.page)
             if not company_rows:
                 return []
             
             available_ipos = []
-            for row in company_rows:
-                try:
-                    company_name_elem = row.query_selector(".company-name span")
-                    share_type_elem = row.query_selector(".share-of-type")
-                    share_group_elem = row.query_selector(".isin")
-                    
-                    if company_name_elem and share_type_elem and share_group_elem:
-                        company_name = company_name_elem.inner_text().strip()
-                        share_type = share_type_elem.inner_text().strip()
-                        share_group = share_group_elem.inner_text().strip()
-                        
-                        if "ipo" in share_type.lower() and "ordinary" in share_group.lower():
-                            apply_button = row.query_selector("button.btn-issue")
-                            
-                            is_applied = False
-                            button_text = ""
-                            if apply_button:
-                                button_text = apply_button.inner_text().strip().lower()
-                                is_applied = "edit" in button_text or "view" in button_text
-                            
-                            if apply_button:
-                                available_ipos.append({
-                                    "index": len(available_ipos) + 1,
-                                    "company_name": company_name,
-                                    "share_type": share_type,
-                                    "share_group": share_group,
-                                    "element": row,
-                                    "apply_button": apply_button,
-                                    "is_applied": is_applied,
-                                    "button_text": button_text
-                                })
-                except Exception:
+            for row_idx, row in enumerate(company_rows):
+                company_name = row['company_name']
+                share_type = row['share_type']
+                share_group = row['share_group']
+                button_text = row['button_text']
+                
+                if company_name is None or share_type is None or share_group is None:
                     continue
+                
+                if button_text is not None and _IPO_RE.search(share_type) and _ORDINARY_RE.search(share_group):
+                    # Plain data only; the button is resolved from row_index when applying
+                    available_ipos.append({
+                        "index": len(available_ipos) + 1,
+                        "company_name": company_name,
+                        "share_type": share_type,
+                        "share_group": share_group,
+                        "row_index": row_idx,
+                        "is_applied": "edit" in button_text or "view" in button_text,
+                        "button_text": button_text
+                    })
             
             return available_ipos
             
@@ -104,7 +175,7 @@ class IPOManager:
         Apply for a specific IPO.
         
         Args:
-            ipo: IPO dictionary with apply_button
+            ipo: IPO dictionary from fetch_available_ipos
             member: Member dictionary with credentials
             
         Returns:
@@ -115,137 +186,70 @@ class IPOManager:
             if ipo.get('is_applied', False):
                 return True, "already_applied"
             
-            # Click Apply button
-            ipo['apply_button'].click()
-            time.sleep(3)
+            # Click Apply button on the selected row only
+            self.page.locator(".company-list").nth(ipo['row_index']).locator("button.btn-issue").click()
             
-            # Fill form
-            self.page.wait_for_selector("select#selectBank", timeout=10000)
-            time.sleep(2)
+            # Fill form once the bank list has loaded
+            _wait_for_options(self.page, "select#selectBank")
             
             # Get minimum quantity from the form
             try:
-                labels = self.page.query_selector_all("label")
                 min_quantity = member['applied_kitta']  # Default to member's setting
                 
-                for label in labels:
-                    if "Minimum Quantity" in label.inner_text():
-                        # Find the sibling form-value div
-                        parent = label.evaluate_handle("el => el.closest('.form-group')")
-                        form_value = parent.as_element().query_selector(".form-value span")
-                        if form_value:
-                            form_min_qty = int(form_value.inner_text().strip())
-                            # Use the maximum of form minimum and member's default
-                            min_quantity = max(min_quantity, form_min_qty)
-                            if form_min_qty > member['applied_kitta']:
-                                console.print(f"[yellow]⚠ Adjusting quantity from {member['applied_kitta']} to minimum {form_min_qty}[/yellow]")
-                            break
+                form_min_qty = _read_min_quantity(self.page)
+                if form_min_qty is not None:
+                    # Use the maximum of form minimum and member's default
+                    min_quantity = max(min_quantity, form_min_qty)
+                    if form_min_qty > member['applied_kitta']:
+                        console.print(f"[yellow]⚠ Adjusting quantity from {member['applied_kitta']} to minimum {form_min_qty}[/yellow]")
             except Exception as e:
                 console.print(f"[dim]Could not read minimum quantity, using default: {e}[/dim]")
                 min_quantity = member['applied_kitta']
             
             # Select bank
-            bank_options = self.page.query_selector_all("select#selectBank option")
-            valid_banks = [opt for opt in bank_options if opt.get_attribute("value")]
-            if valid_banks:
-                self.page.select_option("select#selectBank", valid_banks[0].get_attribute("value"))
+            bank_value = _first_option_value(self.page, "select#selectBank")
+            if bank_value:
+                self.page.select_option("select#selectBank", bank_value)
             else:
                 return False, "No banks found"
-            time.sleep(2)
-            
-            # Select account
-            self.page.wait_for_selector("select#accountNumber", timeout=5000)
-            account_options = self.page.query_selector_all("select#accountNumber option")
-            valid_accounts = [opt for opt in account_options if opt.get_attribute("value")]
-            if valid_accounts:
-                self.page.select_option("select#accountNumber", valid_accounts[0].get_attribute("value"))
+            
+            # Select account (populated once a bank is chosen)
+            _wait_for_options(self.page, "select#accountNumber", timeout=5000)
+            account_value = _first_option_value(self.page, "select#accountNumber")
+            if account_value:
+                self.page.select_option("select#accountNumber", account_value)
             else:
                 return False, "No accounts found"
-            time.sleep(2)
             
             # Fill kitta with adjusted quantity
             self.page.fill("input#appliedKitta", str(min_quantity))
-            time.sleep(1)
             self.page.fill("input#crnNumber", member['crn_number'])
-            time.sleep(1)
             
             # Accept disclaimer
             disclaimer = self.page.query_selector("input#disclaimer")
             if disclaimer:
                 disclaimer.check()
-            time.sleep(1)
             
-            # Click proceed
-            proceed_button = self.page.query_selector("button.btn-primary[type='submit']")
-            if proceed_button:
-                proceed_button.click()
-            else:
+            # Click proceed; click() itself waits for it to enable once the form validates
+            proceed_button = self.page.locator("button.btn-primary[type='submit']").first
+            try:
+                proceed_button.click(timeout=5000)
+            except:
                 return False, "Proceed button not found"
-            time.sleep(3)
             
-            # Enter PIN
-            self.page.wait_for_selector("input#transactionPIN", timeout=10000)
-            time.sleep(2)
-            self.page.fill("input#transactionPIN", member['transaction_pin'])
-            time.sleep(2)
+            # Enter PIN (fill waits for the field to appear and be editable)
+            self.page.fill("input#transactionPIN", member['transaction_pin'], timeout=10000)
             
             # Submit application
-            clicked = self._click_submit_button()
+            clicked = _click_submit_button(self.page)
             if not clicked:
                 return False, "Failed to click submit button"
             
-            time.sleep(5)
+            _wait_for_submission(self.page)
             return True, "success"
             
         except Exception as e:
             return False, str(e)
-    
-    def _click_submit_button(self) -> bool:
-        """Try multiple methods to click the Apply/Submit button."""
-        # Method 1: Find button with text "Apply"
-        try:
-            apply_buttons = self.page.query_selector_all("button:has-text('Apply')")
-            for btn in apply_buttons:
-                if btn.is_visible() and not btn.is_disabled():
-                    btn.click()
-                    return True
-        except:
-            pass
-        
-        # Method 2: Find by class in confirm page
-        try:
-            submit_button = self.page.query_selector("div.confirm-page-btn button.btn-primary[type='submit']")
-            if submit_button and submit_button.is_visible():
-                submit_button.click()
-                return True
-        except:
-            pass
-        
-        # Method 3: Alternative submit button
-        try:
-            submit_button = self.page.query_selector("button.btn-gap.btn-primary[type='submit']")
-            if submit_button and submit_button.is_visible():
-                submit_button.click()
-                return True
-        except:
-            pass
-        
-        # Method 4: JavaScript fallback
-        try:
-            self.page.evaluate("""
-                const buttons = document.querySelectorAll('button');
-                for (const btn of buttons) {
-                    if (btn.textContent.includes('Apply') && btn.type === 'submit') {
-                        btn.click();
-                        break;
-                    }
-                }
-            """)
-            return True
-        except:
-            pass
-        
-        return False
 
 
 def display_ipo_table(ipos: List[Dict]) -> None:
@@ -277,7 +281,9 @@ def display_ipo_table(ipos: List[Dict]) -> None:
 def apply_ipo(
     auto_load: bool = True, 
     headless: bool = False, 
-    member_name: Optional[str] = None
+    member_name: Optional[str] = None,
+    keep_open: bool = False,
+    force_login: bool = False
 ) -> None:
     """
     Apply for IPO with selected member.
@@ -286,8 +292,10 @@ def apply_ipo(
         auto_load: Load credentials from config
         headless: Run browser in headless mode
         member_name: Optional specific member name
+        keep_open: With a visible browser, wait for the user to close it
+        force_login: Log in again even if a saved session is still valid
     """
-    from ..config import get_member_by_name
+    from ..config import get_member_by_name, suggest_member_names
     from ..ui.member_ui import select_family_member
     
     member = None
@@ -295,6 +303,9 @@ def apply_ipo(
         member = get_member_by_name(member_name)
         if not member:
             console.print(f"\n[red]✗ Member '{member_name}' not found.[/red]")
+            suggestions = suggest_member_names(member_name)
+            if suggestions:
+                console.print(f"[yellow]Did you mean: {', '.join(suggestions)}?[/yellow]")
             return
     
     if not member:
@@ -311,8 +322,8 @@ def apply_ipo(
     console.print(f"\n[bold green]✓ Applying IPO for:[/bold green] {member['name']}")
     console.print(f"[bold green]✓ Kitta:[/bold green] {member['applied_kitta']} [bold green]| CRN:[/bold green] {member['crn_number']}")
     
-    auth = MeroshareAuth(headless=headless, slow_mo=100)
-    success, page = auth.login(member, show_progress=True)
+    auth = MeroshareAuth(headless=headless)
+    success, page = auth.login(member, show_progress=True, force_login=force_login)
     
     if not success or not page:
         console.print("[red]✗ Login failed[/red]")
@@ -328,8 +339,8 @@ def apply_ipo(
     
     if not available_ipos:
         console.print("[bold yellow]⚠ No IPOs available[/bold yellow]")
-        if not headless:
-            time.sleep(20)
+        if keep_open and not headless:
+            wait_for_browser_close(page)
         auth.close()
         return
     
@@ -355,19 +366,218 @@ def apply_ipo(
     else:
         console.print(f"[red]✗ Application failed: {status}[/red]")
     
-    if not headless:
-        console.print("\n[dim]Browser will stay open for 30 seconds...[/dim]")
-        time.sleep(30)
+    if keep_open and not headless:
+        wait_for_browser_close(page)
     
     auth.close()
 
 
-def apply_ipo_for_all_members(headless: bool = True) -> None:
+def _apply_on_tab(
+    page: Page, 
+    member: Dict, 
+    selected_ipo: Dict, 
+    tab_index: int, 
+    show_status: bool = True
+) -> Dict:
+    """
+    Apply for the selected IPO on a page where member is logged in.
+    
+    Args:
+        page: Logged-in Meroshare page
+        member: Member dictionary with kitta, CRN and PIN
+        selected_ipo: IPO dictionary from fetch_available_ipos
+        tab_index: Tab number used in progress output
+        show_status: Show spinners (off when several tabs run at once)
+        
+    Returns:
+        Result dict with member, success and status/error keys
+    """
+    # One spinner for the whole application, relabelled per step
+    status = console.status("", spinner="dots") if show_status else None
+    
+    def _step(message: str) -> None:
+        if status:
+            status.update(message)
+    
+    console.print()
+    console.print(Rule(f"[Tab {tab_index}] APPLYING FOR: {member['name']}"))
+    
+    if status:
+        status.start()
+    try:
+        _step(f"[bold green][Tab {tab_index}] Navigating...")
+        page.goto("https://meroshare.cdsc.com.np/#/asba", wait_until="domcontentloaded")
+        page.wait_for_selector(".company-list", timeout=10000)
+        
+        # Find and click IPO
+        ipo_found = False
+        already_applied = False
+        
+        for row_idx, row in enumerate(_read_company_rows(page)):
+            if row['company_name'] is None or selected_ipo['company_name'] not in row['company_name']:
+                continue
+            button_text = row['button_text']
+            if button_text is None:
+                continue
+            
+            if "edit" in button_text or "view" in button_text:
+                already_applied = True
+            else:
+                page.locator(".company-list").nth(row_idx).locator("button.btn-issue").click()
+            ipo_found = True
+            break
+        
+        if already_applied:
+            console.print(f"[green]✓ [Tab {tab_index}] Skipping - already applied[/green]")
+            return {
+                "member": member['name'],
+                "success": True,
+                "status": "already_applied"
+            }
+        
+        if not ipo_found:
+            raise Exception("IPO not found")
+        
+        # Fill form
+        _step(f"[bold green][Tab {tab_index}] Filling form...")
+        _wait_for_options(page, "select#selectBank")
+        
+        # Get minimum quantity from the form
+        try:
+            min_quantity = member['applied_kitta']  # Default to member's setting
+            
+            form_min_qty = _read_min_quantity(page)
+            if form_min_qty is not None:
+                # Use the maximum of form minimum and member's default
+                min_quantity = max(min_quantity, form_min_qty)
+                if form_min_qty > member['applied_kitta']:
+                    console.print(f"[yellow][Tab {tab_index}] Adjusting quantity from {member['applied_kitta']} to minimum {form_min_qty}[/yellow]")
+        except Exception:
+            min_quantity = member['applied_kitta']
+        
+        bank_value = _first_option_value(page, "select#selectBank")
+        if bank_value:
+            page.select_option("select#selectBank", bank_value)
+        
+        _wait_for_options(page, "select#accountNumber", timeout=5000)
+        account_value = _first_option_value(page, "select#accountNumber")
+        if account_value:
+            page.select_option("select#accountNumber", account_value)
+        
+        page.fill("input#appliedKitta", str(min_quantity))
+        page.fill("input#crnNumber", member['crn_number'])
+        
+        disclaimer = page.query_selector("input#disclaimer")
+        if disclaimer:
+            disclaimer.check()
+        
+        # click() waits for proceed to enable once the form validates
+        page.locator("button.btn-primary[type='submit']").first.click(timeout=5000)
+        
+        # Enter PIN and submit
+        _step(f"[bold green][Tab {tab_index}] Submitting...")
+        page.fill("input#transactionPIN", member['transaction_pin'], timeout=10000)
+        
+        if not _click_submit_button(page):
+            raise Exception("Submit button not found")
+        
+        _wait_for_submission(page)
+        
+        console.print(f"[bold green]✓ [Tab {tab_index}] Application submitted for {member['name']}![/bold green]")
+        return {
+            "member": member['name'],
+            "success": True
+        }
+        
+    except Exception as e:
+        console.print(f"[bold red]✗ [Tab {tab_index}] Failed: {e}[/bold red]")
+        try:
+            page.screenshot(path=DATA_DIR / f"error_{member['name']}.png", full_page=DEBUG_FULL_PAGE)
+        except:
+            pass
+        return {
+            "member": member['name'],
+            "success": False,
+            "error": str(e)
+        }
+    finally:
+        if status:
+            status.stop()
+
+
+def _login_and_apply(
+    member: Dict, 
+    selected_ipo: Dict, 
+    tab_index: int, 
+    browser: Browser,
+    force_login: bool = False
+) -> Dict:
+    """Log a member in on their own context of browser and apply."""
+    try:
+        with MeroshareSession(headless=True, browser=browser) as session:
+            success, page = session.login(member, force_login=force_login)
+            if not success:
+                raise Exception("Login failed")
+            console.print(f"[green]✓ [Tab {tab_index}] Login successful: {member['name']}[/green]")
+            return _apply_on_tab(page, member, selected_ipo, tab_index, show_status=False)
+    except Exception as e:
+        console.print(f"[red]✗ [Tab {tab_index}] {e}: {member['name']}[/red]")
+        return {
+            "member": member['name'],
+            "success": False,
+            "error": str(e)
+        }
+
+
+def _apply_batch(
+    batch: List[Tuple[int, Dict]], 
+    selected_ipo: Dict, 
+    force_login: bool = False
+) -> List[Dict]:
+    """
+    Log in and apply for a batch of (tab_index, member) from a worker thread.
+    
+    Playwright's sync objects belong to the thread that created them, so
+    each worker drives its own headless browser rather than a shared tab.
+    That browser is launched once and reused for every member in the batch.
+    """
+    from playwright.sync_api import sync_playwright
+    
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            try:
+                return [
+                    _login_and_apply(member, selected_ipo, idx, browser, force_login)
+                    for idx, member in batch
+                ]
+            finally:
+                browser.close()
+    except Exception as e:
+        console.print(f"[red]✗ Browser failed to start: {e}[/red]")
+        return [
+            {"member": member['name'], "success": False, "error": str(e)}
+            for _, member in batch
+        ]
+
+
+def apply_ipo_for_all_members(
+    headless: bool = True, 
+    keep_open: bool = False, 
+    force_login: bool = False,
+    serial: bool = False
+) -> None:
     """
     Apply IPO for multiple family members using multi-tab browser.
     
+    Headless runs log in only the first member on the shared browser (to
+    list IPOs); the rest log in and apply in parallel worker threads.
+    
     Args:
         headless: Run browser in headless mode
+        keep_open: With a visible browser, wait for the user to close it
+        force_login: Ignore members' saved sessions and log in again
+        serial: Log in and apply one member at a time (for debugging)
     """
     from ..config import get_all_members
     from ..ui.member_ui import select_members_for_ipo
@@ -413,43 +623,77 @@ def apply_ipo_for_all_members(headless: bool = True) -> None:
     console.print(table)
     console.print()
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, slow_mo=100 if not headless else 0)
-        context = browser.new_context()
-        
+    # Weed out bad credentials in parallel over the API before any browser
+    # work; a failed browser login would otherwise burn its full timeout
+    from .portfolio import check_credentials, fetch_capitals, run_for_all_members
+    with console.status("[bold green]Verifying credentials...", spinner="dots"):
+        try:
+            capitals = fetch_capitals()
+            verified = run_for_all_members(lambda m: check_credentials(m, capitals), members)
+        except Exception:
+            verified = [None] * len(members)
+    
+    for member, ok in zip(members, verified):
+        if ok is False:
+            console.print(f"[red]✗ Credentials rejected for {member['name']}, skipping[/red]")
+    members = [member for member, ok in zip(members, verified) if ok is not False]
+    
+    if not members:
+        console.print("[bold red]\n✗ No members with valid credentials. Exiting...[/bold red]")
+        return
+    
+    with MeroshareSession(headless=headless) as session:
         try:
             # Phase 1: Login all members
             console.print()
             console.print(Rule("[bold cyan]PHASE 1: MULTI-TAB LOGIN[/bold cyan]"))
             console.print()
             
+            # Headless: once one member is in, the rest go to parallel workers
+            parallel = headless and not serial and len(members) > 1
             pages_data = []
-            auth = MeroshareAuth(headless=headless)
-            
-            for idx, member in enumerate(members, 1):
-                member_name = member['name']
-                console.print(f"[cyan][Tab {idx}][/cyan] Logging in: [bold]{member_name}[/bold]")
-                
-                with console.status(f"[bold green][Tab {idx}] Logging in...", spinner="dots"):
-                    success, page = auth.login_with_context(member, context)
+            deferred = []
+            
+            # One live bar for every login instead of a spinner per member
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("{task.description}"),
+                BarColumn(),
+                MofNCompleteColumn(),
+                console=console,
+                transient=True
+            ) as progress:
+                task = progress.add_task("[bold green]Logging in...", total=len(members))
                 
-                if success:
-                    console.print(f"[green]✓ [Tab {idx}] Login successful: {member_name}[/green]")
-                    pages_data.append({
-                        "success": True,
-                        "member": member,
-                        "page": page,
-                        "tab_index": idx
-                    })
-                else:
-                    console.print(f"[red]✗ [Tab {idx}] Login failed: {member_name}[/red]")
-                    pages_data.append({
-                        "success": False,
-                        "member": member,
-                        "page": page,
-                        "tab_index": idx,
-                        "error": "Login failed"
-                    })
+                for idx, member in enumerate(members, 1):
+                    if parallel and any(p['success'] for p in pages_data):
+                        deferred.append((idx, member))
+                        progress.advance(task)
+                        continue
+                    
+                    member_name = member['name']
+                    progress.update(task, description=f"[bold green][Tab {idx}] Logging in: {member_name}")
+                    # Own context per member, so saved sessions never mix
+                    success, page = session.login(member, force_login=force_login)
+                    progress.advance(task)
+                    
+                    if success:
+                        console.print(f"[green]✓ [Tab {idx}] Login successful: {member_name}[/green]")
+                        pages_data.append({
+                            "success": True,
+                            "member": member,
+                            "page": page,
+                            "tab_index": idx
+                        })
+                    else:
+                        console.print(f"[red]✗ [Tab {idx}] Login failed: {member_name}[/red]")
+                        pages_data.append({
+                            "success": False,
+                            "member": member,
+                            "page": page,
+                            "tab_index": idx,
+                            "error": "Login failed"
+                        })
             
             successful_logins = [p for p in pages_data if p['success']]
             
@@ -493,160 +737,37 @@ def apply_ipo_for_all_members(headless: bool = True) -> None:
             selected_ipo = available_ipos[selected_idx]
             console.print(Panel(
                 f"[bold green]✓ Selected IPO: {selected_ipo['company_name']}[/bold green]\n"
-                f"[yellow]⚠ Will apply for {len(successful_logins)} member(s)[/yellow]",
+                f"[yellow]⚠ Will apply for {len(successful_logins) + len(deferred)} member(s)[/yellow]",
                 box=box.ROUNDED
             ))
             
             # Apply for each member
             application_results = []
             
-            for page_data in successful_logins:
-                member = page_data['member']
-                page = page_data['page']
-                tab_index = page_data['tab_index']
-                
-                console.print()
-                console.print(Rule(f"[Tab {tab_index}] APPLYING FOR: {member['name']}"))
+            # One browser per worker, shared by the members dealt to it
+            workers = min(len(deferred), 4) or 1
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                deferred_results = []
+                if deferred:
+                    console.print(f"[dim]Logging in {len(deferred)} more member(s) in parallel...[/dim]")
+                    deferred_results = [
+                        executor.submit(_apply_batch, deferred[i::workers], selected_ipo, force_login)
+                        for i in range(workers)
+                    ]
                 
                 try:
-                    with console.status(f"[bold green][Tab {tab_index}] Navigating...", spinner="dots"):
-                        page.goto("https://meroshare.cdsc.com.np/#/asba", wait_until="networkidle")
-                        time.sleep(3)
-                        page.wait_for_selector(".company-list", timeout=10000)
-                        time.sleep(2)
-                    
-                    # Find and click IPO
-                    company_rows = page.query_selector_all(".company-list")
-                    ipo_found = False
-                    already_applied = False
-                    
-                    for row in company_rows:
-                        try:
-                            company_name_elem = row.query_selector(".company-name span")
-                            if company_name_elem and selected_ipo['company_name'] in company_name_elem.inner_text():
-                                apply_button = row.query_selector("button.btn-issue")
-                                if apply_button:
-                                    button_text = apply_button.inner_text().strip().lower()
-                                    
-                                    if "edit" in button_text or "view" in button_text:
-                                        already_applied = True
-                                        ipo_found = True
-                                        break
-                                    else:
-                                        apply_button.click()
-                                        ipo_found = True
-                                        break
-                        except:
-                            continue
-                    
-                    if already_applied:
-                        console.print(f"[green]✓ [Tab {tab_index}] Skipping - already applied[/green]")
-                        application_results.append({
-                            "member": member['name'],
-                            "success": True,
-                            "status": "already_applied"
-                        })
-                        continue
-                    
-                    if not ipo_found:
-                        raise Exception("IPO not found")
-                    
-                    time.sleep(3)
-                    
-                    # Fill form
-                    with console.status(f"[bold green][Tab {tab_index}] Filling form...", spinner="dots"):
-                        page.wait_for_selector("select#selectBank", timeout=10000)
-                        time.sleep(2)
-                        
-                        # Get minimum quantity from the form
-                        try:
-                            labels = page.query_selector_all("label")
-                            min_quantity = member['applied_kitta']  # Default to member's setting
-                            
-                            for label in labels:
-                                if "Minimum Quantity" in label.inner_text():
-                                    # Find the sibling form-value div
-                                    parent = label.evaluate_handle("el => el.closest('.form-group')")
-                                    form_value = parent.as_element().query_selector(".form-value span")
-                                    if form_value:
-                                        form_min_qty = int(form_value.inner_text().strip())
-                                        # Use the maximum of form minimum and member's default
-                                        min_quantity = max(min_quantity, form_min_qty)
-                                        if form_min_qty > member['applied_kitta']:
-                                            console.print(f"[yellow][Tab {tab_index}] Adjusting quantity from {member['applied_kitta']} to minimum {form_min_qty}[/yellow]")
-                                        break
-                        except Exception:
-                            min_quantity = member['applied_kitta']
-                        
-                        bank_options = page.query_selector_all("select#selectBank option")
-                        valid_banks = [opt for opt in bank_options if opt.get_attribute("value")]
-                        if valid_banks:
-                            page.select_option("select#selectBank", valid_banks[0].get_attribute("value"))
-                        time.sleep(2)
-                        
-                        page.wait_for_selector("select#accountNumber", timeout=5000)
-                        account_options = page.query_selector_all("select#accountNumber option")
-                        valid_accounts = [opt for opt in account_options if opt.get_attribute("value")]
-                        if valid_accounts:
-                            page.select_option("select#accountNumber", valid_accounts[0].get_attribute("value"))
-                        time.sleep(2)
-                        
-                        page.fill("input#appliedKitta", str(min_quantity))
-                        time.sleep(1)
-                        page.fill("input#crnNumber", member['crn_number'])
-                        time.sleep(1)
-                        
-                        disclaimer = page.query_selector("input#disclaimer")
-                        if disclaimer:
-                            disclaimer.check()
-                        time.sleep(1)
-                        
-                        proceed = page.query_selector("button.btn-primary[type='submit']")
-                        if proceed:
-                            proceed.click()
-                        time.sleep(3)
-                    
-                    # Enter PIN and submit
-                    with console.status(f"[bold green][Tab {tab_index}] Submitting...", spinner="dots"):
-                        page.wait_for_selector("input#transactionPIN", timeout=10000)
-                        time.sleep(2)
-                        page.fill("input#transactionPIN", member['transaction_pin'])
-                        time.sleep(2)
-                        
-                        # Click submit
-                        try:
-                            apply_buttons = page.query_selector_all("button:has-text('Apply')")
-                            for btn in apply_buttons:
-                                if btn.is_visible() and not btn.is_disabled():
-                                    btn.click()
-                                    break
-                        except:
-                            page.evaluate("""
-                                const buttons = document.querySelectorAll('button');
-                                for (const btn of buttons) {
-                                    if (btn.textContent.includes('Apply') && btn.type === 'submit') {
-                                        btn.click();
-                                        break;
-                                    }
-                                }
-                            """)
-                        
-                        time.sleep(5)
-                    
-                    console.print(f"[bold green]✓ [Tab {tab_index}] Application submitted for {member['name']}![/bold green]")
-                    application_results.append({
-                        "member": member['name'],
-                        "success": True
-                    })
-                    
-                except Exception as e:
-                    console.print(f"[bold red]✗ [Tab {tab_index}] Failed: {e}[/bold red]")
-                    application_results.append({
-                        "member": member['name'],
-                        "success": False,
-                        "error": str(e)
-                    })
-                    page.screenshot(path=str(DATA_DIR / f"error_{member['name']}.png"))
+                    for page_data in successful_logins:
+                        application_results.append(_apply_on_tab(
+                            page_data['page'],
+                            page_data['member'],
+                            selected_ipo,
+                            page_data['tab_index'],
+                            show_status=not deferred
+                        ))
+                finally:
+                    # Always join the workers, even if a tab above blew up
+                    for future in deferred_results:
+                        application_results.extend(future.result())
             
             # Final summary
             console.print()
@@ -671,11 +792,8 @@ def apply_ipo_for_all_members(headless: bool = True) -> None:
             
             console.print(summary_table)
             
-            if not headless:
-                console.print("\n[dim]Browser will stay open for 60 seconds...[/dim]")
-                time.sleep(60)
+            if keep_open and not headless:
+                wait_for_browser_close(first_page)
             
         except Exception as e:
             console.print(f"\n[bold red]✗ Critical error: {e}[/bold red]")
-        finally:
-            browser.close()
@@ -3,9 +3,10 @@ Portfolio Module.
 Handles fetching and displaying portfolio data from Meroshare using direct API calls.
 """
 
-import json
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 import requests
 from tenacity import retry, stop_after_attempt, wait_fixed
 
@@ -14,6 +15,7 @@ from rich.table import Table
 from rich.panel import Panel
 from rich import box
 
+from ..config import CAPITALS_CACHE_FILE, PORTFOLIO_CACHE_FILE, read_json, write_json
 from ..utils.formatting import format_rupees, format_number
 
 console = Console(force_terminal=True, legacy_windows=False)
@@ -24,6 +26,13 @@ console = Console(force_terminal=True, legacy_windows=False)
 USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:142.0) Gecko/20100101 Firefox/142.0"
 MS_API_BASE = "https://webbackend.cdsc.com.np/api"
 
+# The capital (DP) list rarely changes, so it is cached on disk for a week
+CAPITALS_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Holdings only move on trades and LTP updates; a repeat view within
+# five minutes is served from disk (use --refresh to bypass)
+PORTFOLIO_CACHE_TTL = 5 * 60
+
 BASE_HEADERS = {
     "User-Agent": USER_AGENT,
     "Accept": "application/json, text/plain, */*",
@@ -88,6 +97,13 @@ class PortfolioEntry:
             "value_as_of_previous_closing_price": self.value_as_of_previous_closing_price,
         }
 
+    @classmethod
+    def from_json(cls, data: Dict) -> "PortfolioEntry":
+        """Rebuild an entry from to_json() output."""
+        entry = cls()
+        entry.__dict__.update(data)
+        return entry
+
 
 class Portfolio:
     """Represents complete portfolio data."""
@@ -106,10 +122,50 @@ class Portfolio:
             "total_value_as_of_previous_closing_price": self.total_value_as_of_previous_closing_price,
         }
 
+    @classmethod
+    def from_json(cls, data: Dict) -> "Portfolio":
+        """Rebuild a portfolio from to_json() output."""
+        return cls(
+            [PortfolioEntry.from_json(entry) for entry in data["entries"]],
+            data["total_items"],
+            data["total_value_as_of_last_transaction_price"],
+            data["total_value_as_of_previous_closing_price"],
+        )
+
 
 # ==========================================
 # Helper Functions
 # ==========================================
+def fetch_capitals(refresh: bool = False) -> List[Dict]:
+    """
+    Fetch the list of capitals (DPs), using the on-disk cache when fresh.
+    
+    Args:
+        refresh: Ignore the cache and always hit the API
+        
+    Returns:
+        List of capital dictionaries with id, code and name keys
+    """
+    if not refresh:
+        try:
+            cached = read_json(CAPITALS_CACHE_FILE)
+            if time.time() - cached['ts'] < CAPITALS_CACHE_TTL:
+                return cached['data']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    
+    response = requests.get(f"{MS_API_BASE}/meroShare/capital/", headers=BASE_HEADERS)
+    response.raise_for_status()
+    capitals = response.json()
+    
+    try:
+        write_json(CAPITALS_CACHE_FILE, {"ts": time.time(), "data": capitals})
+    except OSError:
+        pass
+    
+    return capitals
+
+
 def fetch_capital_id(dpid_code: str) -> int:
     """
     Fetch Capital ID from DPID Code (e.g. '10900' -> 190).
@@ -123,10 +179,9 @@ def fetch_capital_id(dpid_code: str) -> int:
     console.print(f'[cyan]🔍 Looking up Capital ID for DPID:[/cyan] {dpid_code}')
     
     try:
-        response = requests.get(f"{MS_API_BASE}/meroShare/capital/", headers=BASE_HEADERS)
-        if response.status_code == 200:
-            capitals = response.json()
-            for cap in capitals:
+        # A miss on the cached list may just mean a newly added DP, so retry fresh
+        for refresh in (False, True):
+            for cap in fetch_capitals(refresh=refresh):
                 if cap.get('code') == str(dpid_code):
                     console.print(f"[green]✓ Found Capital:[/green] {cap.get('name')} (ID: {cap.get('id')})")
                     return cap.get('id')
@@ -184,7 +239,7 @@ class Account:
         headers["Content-Type"] = "application/json"
 
         with console.status("[bold green]Logging in...", spinner="dots"):
-            login_req = requests.post(f"{MS_API_BASE}/meroShare/auth/", json=data, headers=headers)
+            login_req = self.__session.post(f"{MS_API_BASE}/meroShare/auth/", json=data, headers=headers)
             
             if login_req.status_code != 200:
                 raise LocalException(f"Login failed with status {login_req.status_code}")
@@ -208,7 +263,7 @@ class Account:
         headers = BASE_HEADERS.copy()
         headers["Authorization"] = self.auth_token
         
-        response = requests.get(f"{MS_API_BASE}/meroShare/ownDetail/", headers=headers)
+        response = self.__session.get(f"{MS_API_BASE}/meroShare/ownDetail/", headers=headers)
 
         if response.status_code == 200:
             data = response.json()
@@ -245,7 +300,7 @@ class Account:
                 "sortAsc": True,
             }
             
-            portfolio_req = requests.post(
+            portfolio_req = self.__session.post(
                 f"{MS_API_BASE}/meroShareView/myPortfolio/",
                 json=payload,
                 headers=headers
@@ -256,13 +311,24 @@ class Account:
 
             data = portfolio_req.json()
             
-            entries = [PortfolioEntry(**item) for item in data.get("meroShareMyPortfolio", [])]
+            # Sum while parsing so totals survive a response without them
+            entries = []
+            sum_ltp = sum_prev = 0.0
+            for item in data.get("meroShareMyPortfolio", []):
+                entry = PortfolioEntry(**item)
+                sum_ltp += entry.value_as_of_last_transaction_price
+                sum_prev += entry.value_as_of_previous_closing_price
+                entries.append(entry)
+            
+            total_ltp = data.get("totalValueAsOfLastTransactionPrice")
+            total_prev = data.get("totalValueAsOfPreviousClosingPrice")
+            total_items = data.get("totalItems")
             
             new_portfolio = Portfolio(
                 entries=entries,
-                total_items=data.get("totalItems"),
-                total_val_ltp=float(data.get("totalValueAsOfLastTransactionPrice", 0)),
-                total_val_prev=float(data.get("totalValueAsOfPreviousClosingPrice", 0)),
+                total_items=total_items if total_items is not None else len(entries),
+                total_val_ltp=float(total_ltp) if total_ltp is not None else sum_ltp,
+                total_val_prev=float(total_prev) if total_prev is not None else sum_prev,
             )
 
             self.portfolio = new_portfolio
@@ -289,7 +355,7 @@ class Account:
 
         payload = {"demat": self.dmat}
 
-        wacc_req = requests.post(
+        wacc_req = self.__session.post(
             f"{MS_API_BASE}/myPurchase/waccReport/",
             json=payload,
             headers=headers,
@@ -303,6 +369,118 @@ class Account:
 
 
 
+def resolve_dpid_code(member: Dict) -> Optional[str]:
+    """
+    Get a member's DPID code, parsing it out of dp_value if not stored.
+    
+    Args:
+        member: Dict with dp_value and optionally dpid_code keys
+        
+    Returns:
+        DPID code string or None if it can't be determined
+    """
+    dp_value = member.get('dp_value', '')
+    dpid_code = member.get('dpid_code')
+    
+    # Try to extract from dp_value if dpid_code not provided
+    if not dpid_code and dp_value:
+        # Try to extract numeric portion
+        import re
+        match = re.search(r'\((\d+)\)', dp_value)
+        if match:
+            dpid_code = match.group(1)
+        elif dp_value.isdigit():
+            dpid_code = dp_value
+    
+    return dpid_code
+
+
+def api_login(member: Dict) -> Account:
+    """
+    Log a member in through the Meroshare API, without a browser.
+    
+    Args:
+        member: Dict with dp_value, username, password keys
+        
+    Returns:
+        Logged-in Account
+        
+    Raises:
+        LocalException: If the DPID code is unknown or login fails
+    """
+    dpid_code = resolve_dpid_code(member)
+    if not dpid_code:
+        raise LocalException("Could not determine DPID code")
+    
+    account = Account(
+        username=member['username'],
+        password=member['password'],
+        dpid_code=dpid_code,
+        capital_id=fetch_capital_id(dpid_code)
+    )
+    account.login()
+    return account
+
+
+# Statuses the Meroshare login API answers bad credentials with
+CREDENTIAL_REJECTED_STATUSES = frozenset({401, 403})
+
+
+def check_credentials(member: Dict, capitals: List[Dict]) -> Optional[bool]:
+    """
+    Quietly check a member's credentials against the login API.
+    
+    Args:
+        member: Dict with dp_value, username, password keys
+        capitals: Capital list from fetch_capitals()
+        
+    Returns:
+        True if accepted, False only if the API rejected the credentials
+        (401/403), None if it couldn't be checked (network error, 429, 5xx)
+    """
+    try:
+        dpid_code = resolve_dpid_code(member)
+        capital_id = next((cap.get('id') for cap in capitals if cap.get('code') == str(dpid_code)), None)
+        if not dpid_code or capital_id is None:
+            return None
+        
+        headers = BASE_HEADERS.copy()
+        headers["Authorization"] = "null"
+        data = {
+            "clientId": str(capital_id),
+            "username": member['username'],
+            "password": member['password'],
+        }
+        response = requests.post(f"{MS_API_BASE}/meroShare/auth/", json=data, headers=headers, timeout=15)
+        if response.status_code == 200:
+            return True
+        # Only a real rejection drops the member; 429/5xx/gateway errors
+        # leave it to the browser login to decide
+        if response.status_code in CREDENTIAL_REJECTED_STATUSES:
+            return False
+        return None
+    except Exception:
+        return None
+
+
+def run_for_all_members(fn: Callable[[Dict], object], members: List[Dict], max_workers: int = 4) -> List:
+    """
+    Run fn(member) for every member concurrently.
+    
+    Args:
+        fn: Network-bound callable taking a member dict
+        members: Members to process
+        max_workers: Upper bound on concurrent workers
+        
+    Returns:
+        Results in the same order as members
+    """
+    if not members:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(members))) as pool:
+        return list(pool.map(fn, members))
+
+
 class PortfolioFetcher:
     """Handles portfolio fetching operations."""
     
@@ -324,40 +502,13 @@ class PortfolioFetcher:
             Portfolio object or None if failed
         """
         try:
-            # Extract DPID code from dp_value or member dict
-            dp_value = self.member.get('dp_value', '')
-            dpid_code = self.member.get('dpid_code')
-            
-            # Try to extract from dp_value if dpid_code not provided
-            if not dpid_code and dp_value:
-                # Try to extract numeric portion
-                import re
-                match = re.search(r'\((\d+)\)', dp_value)
-                if match:
-                    dpid_code = match.group(1)
-                elif dp_value.isdigit():
-                    dpid_code = dp_value
-            
-            if not dpid_code:
+            if not resolve_dpid_code(self.member):
                 console.print("[red]✗ Could not determine DPID code[/red]")
                 return None
             
-            # Get capital ID
-            capital_id = fetch_capital_id(dpid_code)
-            
-            # Create account and login
-            self.account = Account(
-                username=self.member['username'],
-                password=self.member['password'],
-                dpid_code=dpid_code,
-                capital_id=capital_id
-            )
-            
-            self.account.login()
-            time.sleep(0.5)
-            
+            # Get capital ID, create account and login
+            self.account = api_login(self.member)
             self.account.fetch_own_details()
-            time.sleep(0.5)
             
             portfolio = self.account.fetch_portfolio()
             
@@ -368,6 +519,35 @@ class PortfolioFetcher:
             return None
 
 
+def _portfolio_cache_key(member: Dict) -> str:
+    return f"{member['dp_value']}:{member['username']}"
+
+
+def load_cached_portfolio(member: Dict) -> Optional[Tuple[Portfolio, float]]:
+    """Return (portfolio, fetched_ts) if the member's cached copy is still fresh."""
+    try:
+        cached = read_json(PORTFOLIO_CACHE_FILE)[_portfolio_cache_key(member)]
+        if time.time() - cached['ts'] < PORTFOLIO_CACHE_TTL:
+            return Portfolio.from_json(cached['data']), cached['ts']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def cache_portfolio(member: Dict, portfolio: Portfolio) -> None:
+    """Store a freshly fetched portfolio for load_cached_portfolio."""
+    try:
+        cache = read_json(PORTFOLIO_CACHE_FILE)
+    except (OSError, ValueError):
+        cache = {}
+    
+    cache[_portfolio_cache_key(member)] = {"ts": time.time(), "data": portfolio.to_json()}
+    try:
+        write_json(PORTFOLIO_CACHE_FILE, cache)
+    except OSError:
+        pass
+
+
 def display_portfolio_table(member_name: str, portfolio: Portfolio) -> Table:
     """
     Create a Rich table for portfolio display.
@@ -472,13 +652,17 @@ def save_portfolio_to_file(portfolio: Portfolio, member_name: str = "", filename
         "portfolio": portfolio.to_json()
     }
     
-    with open(filename, 'w') as f:
-        json.dump(output, f, indent=2)
+    write_json(Path(filename), output)
     
     console.print(f"[dim]💾 Portfolio data saved to: {filename}[/dim]\n")
 
 
-def get_portfolio_for_member(member: Dict, save_to_file: bool = False, headless: bool = True) -> Optional[Portfolio]:
+def get_portfolio_for_member(
+    member: Dict, 
+    save_to_file: bool = False, 
+    headless: bool = True, 
+    refresh: bool = False
+) -> Optional[Portfolio]:
     """
     Get portfolio for a specific family member using direct API.
     
@@ -486,6 +670,7 @@ def get_portfolio_for_member(member: Dict, save_to_file: bool = False, headless:
         member: Member dictionary with credentials
         save_to_file: Whether to save portfolio to file (default: False)
         headless: Kept for backward compatibility (no longer used since we use direct API)
+        refresh: Ignore a recently cached portfolio and fetch again
         
     Returns:
         Portfolio object or None if failed
@@ -494,8 +679,14 @@ def get_portfolio_for_member(member: Dict, save_to_file: bool = False, headless:
     console.print(f"[bold white]Fetching Portfolio for: {member['name']}[/bold white]")
     console.print(f"[bold cyan]{'='*70}[/bold cyan]\n")
     
-    fetcher = PortfolioFetcher(member)
-    portfolio = fetcher.fetch()
+    cached = None if refresh else load_cached_portfolio(member)
+    if cached:
+        portfolio, fetched_ts = cached
+        fetched_at = time.strftime("%I:%M:%S %p", time.localtime(fetched_ts))
+        console.print(f"[dim]Showing portfolio fetched at {fetched_at} (use --refresh to fetch again)[/dim]\n")
+    else:
+        fetcher = PortfolioFetcher(member)
+        portfolio = fetcher.fetch()
     
     if portfolio:
         # Display summary panel
@@ -508,6 +699,10 @@ def get_portfolio_for_member(member: Dict, save_to_file: bool = False, headless:
         console.print(table)
         console.print()
         
+        # Disk writes come after the tables so they never delay the output
+        if not cached:
+            cache_portfolio(member, portfolio)
+        
         # Save to file (optional)
         if save_to_file:
             save_portfolio_to_file(portfolio, member['name'])
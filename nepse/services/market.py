@@ -4,34 +4,136 @@ Handles fetching and displaying NEPSE market data from various APIs.
 """
 
 import time
+import cloudscraper
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from bs4 import BeautifulSoup
+from lxml import html
 
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from rich.text import Text
-from rich.columns import Columns
-from rich.rule import Rule
 from rich import box
 
 from ..utils.formatting import format_number, format_rupees
 
 console = Console(force_terminal=True, legacy_windows=False)
 
+# Shared HTTP session so repeated commands reuse pooled TCP/TLS connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Worker pool for firing independent requests to different sites concurrently
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Cloudflare-aware scraper for NepseAlpha, created on first use and then reused
+_scraper = None
+
+# NepseAlpha live data is reused briefly so back-to-back commands skip the refetch
+_LIVE_CACHE_TTL = 8
+_live_cache = {"ts": 0.0, "data": None}
+
+# Upper bound on scraped HTML pages so a misbehaving server cannot stall parsing
+MAX_HTML_BYTES = 2 * 1024 * 1024
+
+# Cache validators from the last response per URL, for conditional re-fetches
+_validators: Dict[str, Dict[str, str]] = {}
+
+
+def _parse_iso(value: str) -> Optional[datetime]:
+    """
+    Parse an ISO-8601 timestamp from the API, or None if it is malformed.
+    
+    Offset timestamps are converted to naive local time, so callers can
+    compare the result with datetime.now().
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def _prev_close(close: float, pct_change: float) -> float:
+    """Back out the previous close from the current close and percent change."""
+    factor = 1.0 + (pct_change or 0) / 100.0
+    return close / factor if factor else close
+
+
+def _fetch_html(url: str, conditional: bool = False) -> Optional[bytes]:
+    """
+    Fetch at most MAX_HTML_BYTES of a page as raw bytes for lxml to parse.
+    
+    Args:
+        url: Page to fetch
+        conditional: Revalidate with the ETag/Last-Modified of the previous
+            response and return None when the server answers 304
+        
+    Returns:
+        Page bytes, or None if the page is unchanged
+    """
+    headers = {}
+    if conditional:
+        saved = _validators.get(url, {})
+        if "ETag" in saved:
+            headers["If-None-Match"] = saved["ETag"]
+        if "Last-Modified" in saved:
+            headers["If-Modified-Since"] = saved["Last-Modified"]
+    
+    with SESSION.get(url, headers=headers, timeout=10, stream=True) as response:
+        if response.status_code == 304:
+            return None
+        _validators[url] = {
+            key: response.headers[key]
+            for key in ("ETag", "Last-Modified")
+            if key in response.headers
+        }
+        return response.raw.read(MAX_HTML_BYTES, decode_content=True)
+
+
+def _fetch_sharehub_home() -> Optional[Dict]:
+    """Fetch ShareHub's live home-page data, or None if it is unavailable."""
+    try:
+        response = SESSION.get(
+            "https://sharehubnepal.com/live/api/v2/nepselive/home-page-data",
+            timeout=10
+        )
+        if response.status_code == 200:
+            return response.json()
+    except:
+        pass
+    return None
+
+
+def _fetch_live_stocks() -> Dict:
+    """Fetch NepseAlpha's live stocks/indices data, reusing a very recent copy."""
+    if _live_cache["data"] is not None and time.time() - _live_cache["ts"] < _LIVE_CACHE_TTL:
+        return _live_cache["data"]
+    
+    global _scraper
+    if _scraper is None:
+        _scraper = cloudscraper.create_scraper()
+    
+    response = _scraper.get("https://nepsealpha.com/live/stocks", timeout=10)
+    response.raise_for_status()
+    data = response.json()
+    
+    _live_cache["ts"] = time.time()
+    _live_cache["data"] = data
+    return data
+
 
 def get_ss_time() -> str:
     """Get timestamp from ShareSansar market summary."""
     try:
-        response = requests.get("https://www.sharesansar.com/market-summary", timeout=10)
-        soup = BeautifulSoup(response.text, "lxml")
-        summary_cont = soup.find("div", id="market_symmary_data")
-        if summary_cont is not None:
-            msdate = summary_cont.find("h5").find("span")
-            if msdate is not None:
-                return msdate.text
+        tree = html.fromstring(_fetch_html("https://www.sharesansar.com/market-summary"))
+        msdate = tree.xpath('(//div[@id="market_symmary_data"]//h5)[1]//span')
+        if msdate:
+            return msdate[0].text_content()
     except:
         pass
     return "N/A"
@@ -41,7 +143,7 @@ def cmd_ipo() -> None:
     """Display all open IPOs/public offerings."""
     try:
         with console.status("[bold green]Fetching open IPOs...", spinner="dots"):
-            response = requests.get(
+            response = SESSION.get(
                 "https://sharehubnepal.com/data/api/v1/public-offering",
                 timeout=10
             )
@@ -101,19 +203,17 @@ def cmd_ipo() -> None:
             extended_closing = ipo.get('extendedClosingDate', None)
             ipo_type = ipo.get('type', 'N/A')
             
-            try:
-                closing_date_obj = datetime.fromisoformat(closing_date.replace('T', ' '))
-                closing_date_str = closing_date_obj.strftime('%d %b')
-            except:
-                closing_date_str = closing_date
+            closing_date_obj = _parse_iso(closing_date)
+            closing_date_str = closing_date_obj.strftime('%d %b') if closing_date_obj else closing_date
             
             # Calculate urgency
             urgency_text = ""
             urgency_style = "white"
             
-            try:
-                target_date = extended_closing if extended_closing else closing_date
-                target_date_obj = datetime.fromisoformat(target_date.replace('T', ' '))
+            target_date_obj = _parse_iso(extended_closing) if extended_closing else closing_date_obj
+            if target_date_obj is None:
+                urgency_text = "Check dates"
+            else:
                 days_left = (target_date_obj - datetime.now()).days
                 
                 if days_left >= 0:
@@ -126,8 +226,6 @@ def cmd_ipo() -> None:
                     else:
                         urgency_text = f"📅 {days_left}d"
                         urgency_style = "green"
-            except:
-                urgency_text = "Check dates"
             
             type_emojis = {
                 'Ipo': '🆕 IPO',
@@ -164,31 +262,20 @@ def cmd_nepse() -> None:
     """Display NEPSE indices data."""
     try:
         with console.status("[bold green]Fetching NEPSE indices...", spinner="dots"):
-            import cloudscraper
-            scraper = cloudscraper.create_scraper()
+            # ShareHub data is optional, fetch it while NepseAlpha is in flight
+            sharehub_future = _EXECUTOR.submit(_fetch_sharehub_home)
             
-            url = "https://nepsealpha.com/live/stocks"
-            response = scraper.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = _fetch_live_stocks()
             
-            # Fetch ShareHub data
             market_status = "UNKNOWN"
             market_summary = None
             stock_summary = None
-            try:
-                sharehub_response = requests.get(
-                    "https://sharehubnepal.com/live/api/v2/nepselive/home-page-data",
-                    timeout=10
-                )
-                if sharehub_response.status_code == 200:
-                    sharehub_data = sharehub_response.json()
-                    market_status_obj = sharehub_data.get('marketStatus', {})
-                    market_status = market_status_obj.get('status', 'UNKNOWN')
-                    market_summary = sharehub_data.get('marketSummary', [])
-                    stock_summary = sharehub_data.get('stockSummary', {})
-            except:
-                pass
+            sharehub_data = sharehub_future.result()
+            if sharehub_data:
+                market_status_obj = sharehub_data.get('marketStatus', {})
+                market_status = market_status_obj.get('status', 'UNKNOWN')
+                market_summary = sharehub_data.get('marketSummary', [])
+                stock_summary = sharehub_data.get('stockSummary', {})
         
         prices = data.get('stock_live', {}).get('prices', [])
         indices = [item for item in prices if item.get('stockinfo', {}).get('type') == 'index']
@@ -247,14 +334,7 @@ def cmd_nepse() -> None:
             high_val = item.get('high', 0)
             turnover = item.get('volume', 0)
             
-            try:
-                if pct_change != 0 and close_val != 0:
-                    prev_close = close_val / (1 + pct_change / 100)
-                    point_change = close_val - prev_close
-                else:
-                    point_change = 0
-            except:
-                point_change = 0
+            point_change = close_val - _prev_close(close_val, pct_change)
             
             color = "green" if pct_change > 0 else "red" if pct_change < 0 else "yellow"
             trend_icon = "▲" if pct_change > 0 else "▼" if pct_change < 0 else "•"
@@ -283,15 +363,14 @@ def cmd_nepse() -> None:
                 border_style="cyan"
             )
             
+            # Each metric becomes one column, so headers and values are built in one pass
+            row_values = []
             for item in market_summary:
                 metric_name = item.get('name', 'N/A')
+                metric_value = item.get('value', 0)
+                
                 short_name = metric_name.replace('Total ', '').replace(' Rs:', '').replace(':', '')
                 market_table.add_column(short_name, justify="right", style="cyan")
-            
-            row_values = []
-            for item in market_summary:
-                metric_value = item.get('value', 0)
-                metric_name = item.get('name', 'N/A')
                 
                 if 'Turnover' in metric_name:
                     formatted_value = f"Rs. {metric_value:,.2f}"
@@ -362,14 +441,7 @@ def cmd_nepse() -> None:
                 low_val = item.get('low', 0)
                 high_val = item.get('high', 0)
                 
-                try:
-                    if pct_change != 0 and close_val != 0:
-                        prev_close = close_val / (1 + pct_change / 100)
-                        point_change = close_val - prev_close
-                    else:
-                        point_change = 0
-                except:
-                    point_change = 0
+                point_change = close_val - _prev_close(close_val, pct_change)
                 
                 color = "green" if pct_change > 0 else "red" if pct_change < 0 else "yellow"
                 trend_icon = "▲" if pct_change > 0 else "▼" if pct_change < 0 else "•"
@@ -417,11 +489,7 @@ def cmd_subidx(subindex_name: str) -> None:
         }
         
         with console.status(f"[bold green]Fetching {subindex_name} data...", spinner="dots"):
-            import cloudscraper
-            scraper = cloudscraper.create_scraper()
-            response = scraper.get("https://nepsealpha.com/live/stocks", timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = _fetch_live_stocks()
         
         search_symbol = sub_index_mapping.get(subindex_name, subindex_name)
         
@@ -464,14 +532,7 @@ def cmd_subidx(subindex_name: str) -> None:
         open_val = sub_index_data.get('open', 0)
         turnover = sub_index_data.get('volume', 0)
         
-        try:
-            if pct_change != 0 and close_val != 0:
-                prev_close = close_val / (1 + pct_change / 100)
-                point_change = close_val - prev_close
-            else:
-                point_change = 0
-        except:
-            point_change = 0
+        point_change = close_val - _prev_close(close_val, pct_change)
         
         color = "green" if pct_change > 0 else "red" if pct_change < 0 else "yellow"
         trend_icon = "▲" if pct_change > 0 else "▼" if pct_change < 0 else "•"
@@ -502,83 +563,113 @@ def cmd_subidx(subindex_name: str) -> None:
         console.print(f"[bold red]⚠️  Error fetching sub-index data:[/bold red] {str(e)}\n")
 
 
+# Column layout for the top gainers/losers tables: (header, style, justify, width).
+# A style of None on "%Chg" is filled in with the table's accent colour. Fixed
+# widths let Rich skip measuring every cell; expand still pads them to full width.
+_TOPGL_COLUMNS = (
+    ("#", "dim", "left", 4),
+    ("Symbol", "bold white", "left", 10),
+    ("LTP", None, "right", 10),
+    ("%Chg", None, "right", 8),
+    ("High", "dim", "right", 10),
+    ("Low", "dim", "right", 10),
+    ("Volume", None, "right", 12),
+)
+
+_MEDALS = ("🥇", "🥈", "🥉") + ("",) * 7
+
+# Last parsed merolagani rows, reused when the page has not changed
+_topgl_cache = {"rows": None}
+
+
+def _new_topgl_table(title: str, color: str) -> Table:
+    """Create an empty gainers/losers table using the shared column layout."""
+    table = Table(
+        title=title,
+        box=box.ROUNDED,
+        header_style=f"bold {color}",
+        expand=True
+    )
+    for header, style, justify, width in _TOPGL_COLUMNS:
+        if header == "%Chg":
+            style = color
+        table.add_column(header, style=style, justify=justify, width=width)
+    return table
+
+
+def _fetch_topgl_rows() -> Tuple[List[List[str]], List[List[str]]]:
+    """
+    Fetch the top gainers and losers cell text from merolagani.
+    
+    The parsed rows are kept so that an unchanged page (HTTP 304) can be
+    shown again without downloading or parsing it.
+    
+    Returns:
+        Tuple of (gainers_rows, losers_rows), each a list of cell-text lists
+    """
+    content = _fetch_html(
+        "https://merolagani.com/LatestMarket.aspx",
+        conditional=_topgl_cache["rows"] is not None
+    )
+    if content is None:
+        return _topgl_cache["rows"]
+    
+    tree = html.fromstring(content)
+    tgtl_tables = tree.xpath('(//div[@class="col-md-4 hidden-xs hidden-sm"])[1]//table')
+    
+    # Only data rows carry the full set of cells, so the header is filtered out here
+    gainers_row, losers_row = [
+        [
+            [td.text_content() for td in tr.findall('td')[:7]]
+            for tr in table.xpath('.//tr[count(td) >= 8]')
+        ]
+        for table in tgtl_tables[:2]
+    ]
+    
+    _topgl_cache["rows"] = (gainers_row, losers_row)
+    return gainers_row, losers_row
+
+
 def cmd_topgl() -> None:
     """Display top 10 gainers and losers."""
     try:
         with console.status("[bold green]Fetching top gainers and losers...", spinner="dots"):
-            response = requests.get("https://merolagani.com/LatestMarket.aspx", timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            tgtl_col = soup.find('div', class_="col-md-4 hidden-xs hidden-sm")
-            tgtl_tables = tgtl_col.find_all('table')
-            
-            gainers = tgtl_tables[0]
-            gainers_row = gainers.find_all('tr')
-            
-            losers = tgtl_tables[1]
-            losers_row = losers.find_all('tr')
+            # The ShareSansar timestamp is independent of merolagani, fetch both at once
+            ss_time_future = _EXECUTOR.submit(get_ss_time)
+            gainers_row, losers_row = _fetch_topgl_rows()
         
         # Gainers Table
-        g_table = Table(
-            title="📈 TOP 10 GAINERS",
-            box=box.ROUNDED,
-            header_style="bold green",
-            expand=True
-        )
-        g_table.add_column("#", style="dim", width=4)
-        g_table.add_column("Symbol", style="bold white")
-        g_table.add_column("LTP", justify="right")
-        g_table.add_column("%Chg", justify="right", style="green")
-        g_table.add_column("High", justify="right", style="dim")
-        g_table.add_column("Low", justify="right", style="dim")
-        g_table.add_column("Volume", justify="right")
-        
-        for idx, tr in enumerate(gainers_row[1:], 1):
-            tds = tr.find_all('td')
-            if tds and len(tds) >= 8:
-                medal = ["🥇", "🥈", "🥉"] + [""] * 7
-                g_table.add_row(
-                    f"{idx} {medal[idx-1]}",
-                    tds[0].text,
-                    tds[1].text,
-                    f"+{tds[2].text}%",
-                    tds[3].text,
-                    tds[4].text,
-                    format_number(tds[6].text)
-                )
+        g_table = _new_topgl_table("📈 TOP 10 GAINERS", "green")
+        
+        for idx, cells in enumerate(gainers_row, 1):
+            g_table.add_row(
+                f"{idx} {_MEDALS[idx-1]}",
+                cells[0],
+                cells[1],
+                f"+{cells[2]}%",
+                cells[3],
+                cells[4],
+                format_number(cells[6])
+            )
         
         # Losers Table
-        l_table = Table(
-            title="📉 TOP 10 LOSERS",
-            box=box.ROUNDED,
-            header_style="bold red",
-            expand=True
-        )
-        l_table.add_column("#", style="dim", width=4)
-        l_table.add_column("Symbol", style="bold white")
-        l_table.add_column("LTP", justify="right")
-        l_table.add_column("%Chg", justify="right", style="red")
-        l_table.add_column("High", justify="right", style="dim")
-        l_table.add_column("Low", justify="right", style="dim")
-        l_table.add_column("Volume", justify="right")
-        
-        for idx, tr in enumerate(losers_row[1:], 1):
-            tds = tr.find_all('td')
-            if tds and len(tds) >= 8:
-                l_table.add_row(
-                    str(idx),
-                    tds[0].text,
-                    tds[1].text,
-                    f"-{tds[2].text}%",
-                    tds[3].text,
-                    tds[4].text,
-                    format_number(tds[6].text)
-                )
+        l_table = _new_topgl_table("📉 TOP 10 LOSERS", "red")
+        
+        for idx, cells in enumerate(losers_row, 1):
+            l_table.add_row(
+                str(idx),
+                cells[0],
+                cells[1],
+                f"-{cells[2]}%",
+                cells[3],
+                cells[4],
+                format_number(cells[6])
+            )
         
         console.print(g_table)
         console.print(l_table)
         
-        timestamp = get_ss_time()
+        timestamp = ss_time_future.result()
         console.print(f"[dim]As of: {timestamp}[/dim]\n", justify="center")
         
     except Exception as e:
@@ -598,26 +689,22 @@ def cmd_stonk(stock_names: str) -> None:
             return
         
         with console.status(f"[bold green]Fetching {len(stock_list)} stock(s)...", spinner="dots"):
-            import cloudscraper
-            scraper = cloudscraper.create_scraper()
-            
-            response = scraper.get('https://nepsealpha.com/live/stocks', timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            data = _fetch_live_stocks()
             
             prices = data.get('stock_live', {}).get('prices', [])
             timestamp = data.get('stock_live', {}).get('asOf', 'N/A')
         
+        # Index prices by symbol once so each requested stock is a dict lookup
+        by_symbol = {}
+        for item in prices:
+            by_symbol.setdefault((item.get('symbol') or '').upper(), item)
+        
         # Find data for each requested stock
         found_stocks = []
         not_found = []
         
         for stock_name in stock_list:
-            stock_data = None
-            for item in prices:
-                if item.get('symbol', '').upper() == stock_name:
-                    stock_data = item
-                    break
+            stock_data = by_symbol.get(stock_name)
             
             if stock_data:
                 found_stocks.append((stock_name, stock_data))
@@ -629,16 +716,8 @@ def cmd_stonk(stock_names: str) -> None:
             close_price = stock_price_data.get("close", 0)
             percent_change = stock_price_data.get("percent_change", 0)
             
-            try:
-                if percent_change != 0 and close_price != 0:
-                    prev_close = close_price / (1 + percent_change / 100)
-                    pt_change = close_price - prev_close
-                else:
-                    prev_close = close_price
-                    pt_change = 0
-            except:
-                prev_close = close_price
-                pt_change = 0
+            prev_close = _prev_close(close_price, percent_change)
+            pt_change = close_price - prev_close
             
             color = "green" if pt_change > 0 else "red" if pt_change < 0 else "yellow"
             trend_icon = "▲" if pt_change > 0 else "▼" if pt_change < 0 else "•"
@@ -696,7 +775,7 @@ def cmd_mktsum() -> None:
         with console.status("[bold green]Fetching market data...", spinner="dots"):
             try:
                 url = "https://sharehubnepal.com/live/api/v2/nepselive/home-page-data"
-                response = requests.get(url, timeout=10)
+                response = SESSION.get(url, timeout=10)
                 if response.status_code == 200:
                     sharehub_data = response.json()
             except Exception as e:
@@ -840,7 +919,7 @@ def get_dp_list() -> None:
     """Fetch and display available DP list from API."""
     try:
         with console.status("[bold green]Fetching DP list...", spinner="dots"):
-            response = requests.get("https://webbackend.cdsc.com.np/api/meroShare/capital/")
+            response = SESSION.get("https://webbackend.cdsc.com.np/api/meroShare/capital/")
             response.raise_for_status()
             dp_data = response.json()
             dp_data.sort(key=lambda x: x['name'])
@@ -4,8 +4,10 @@ CLI Command handling and interactive shell.
 
 import sys
 import shlex
-import difflib
-from typing import Dict, List
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 
 from prompt_toolkit import PromptSession
 from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
@@ -15,13 +17,12 @@ from prompt_toolkit.shortcuts import CompleteStyle
 from prompt_toolkit.patch_stdout import patch_stdout, StdoutProxy
 from prompt_toolkit.formatted_text import FormattedText
 
-from rich.console import Console, Group
+from rich.console import Group
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
-from rich import box
 
-from ..config import CLI_HISTORY_FILE, ensure_history_file, get_member_by_name
+from ..config import CLI_HISTORY_FILE, ensure_history_file, get_member_by_name, suggest_member_names
 from .console import CLI_PROMPT_STYLE, print_logo, console
 
 # Command metadata
@@ -33,9 +34,16 @@ COMMAND_CATEGORY_ORDER = [
 ]
 
 
+def _normalize(text: str) -> str:
+    """Casefold text and strip diacritics so "népse" matches "nepse"."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).casefold()
+
+
+@lru_cache(maxsize=None)
 def get_command_metadata() -> List[Dict]:
-    """Return metadata for all commands."""
-    return [
+    """Return metadata for all commands (built once and shared)."""
+    commands = [
         # Market Data
         {"name": "nepse", "description": "Display NEPSE indices", "category": "Market Data"},
         {"name": "subidx <name>", "description": "Show sub-index details", "category": "Market Data"},
@@ -45,8 +53,8 @@ def get_command_metadata() -> List[Dict]:
         {"name": "ipo", "description": "List open IPOs", "category": "IPO Management"},
         
         # IPO Management
-        {"name": "apply", "description": "Apply for IPO (use --gui for browser)", "category": "IPO Management"},
-        {"name": "apply-all", "description": "Apply IPO for all members", "category": "IPO Management"},
+        {"name": "apply", "description": "Apply for IPO (--gui for browser, --keep-open to inspect)", "category": "IPO Management"},
+        {"name": "apply-all", "description": "Apply IPO for all members (--serial for one at a time)", "category": "IPO Management"},
         
         # Configuration
         {"name": "add", "description": "Add new family member", "category": "Configuration"},
@@ -55,67 +63,195 @@ def get_command_metadata() -> List[Dict]:
         {"name": "delete", "description": "Delete family member", "category": "Configuration"},
         {"name": "manage", "description": "Member management menu", "category": "Configuration"},
         {"name": "login [name]", "description": "Test login for member", "category": "Configuration"},
-        {"name": "portfolio [name]", "description": "Get portfolio for member", "category": "Configuration"},
+        {"name": "portfolio [name]", "description": "Get portfolio for member (--refresh to skip cache)", "category": "Configuration"},
         {"name": "dp-list", "description": "List available DPs", "category": "Configuration"},
         
         # Interactive
         {"name": "help", "description": "Show help information", "category": "Interactive Tools"},
         {"name": "exit", "description": "Exit the CLI", "category": "Interactive Tools"},
     ]
+    
+    # Normalized search keys are computed once here instead of on every keystroke
+    for command in commands:
+        command['_name_norm'] = _normalize(command['name'])
+        command['_desc_norm'] = _normalize(command['description'])
+        command['_haystack_norm'] = f"{command['_name_norm']} {command['_desc_norm']}"
+    
+    return commands
+
+
+_WORD_BOUNDARIES = frozenset("-_ ")
+
+
+def _subseq_score(pattern: str, text: str) -> int:
+    """
+    Score text against pattern as an in-order subsequence, in a single pass.
+    
+    Each matched character scores a point, with bonuses for matches at the
+    start of a word and for consecutive runs, so "aply" matches "apply"
+    and "pfl" matches "portfolio".
+    
+    Returns:
+        Match score, or -1 if pattern is not a subsequence of text
+    """
+    if not pattern:
+        return 0
+    
+    score = 0
+    p_idx = 0
+    last_match = -2
+    for t_idx, char in enumerate(text):
+        if char != pattern[p_idx]:
+            continue
+        score += 1
+        if t_idx == 0 or text[t_idx - 1] in _WORD_BOUNDARIES:
+            score += 2
+        if t_idx == last_match + 1:
+            score += 1
+        last_match = t_idx
+        p_idx += 1
+        if p_idx == len(pattern):
+            return score
+    return -1
+
+
+class PaletteFilterState:
+    """Remembers the last palette query so typing forward can narrow its result."""
+    
+    def __init__(self):
+        self.last_query = ""
+        self.last_result: Tuple[int, ...] = ()
+    
+    def candidates(self, query_norm: str) -> Optional[Tuple[int, ...]]:
+        """Return indices worth rescanning for query_norm, or None for all."""
+        if not self.last_query or not query_norm.startswith(self.last_query):
+            return None
+        # Fuzzy matching only starts at 3 characters, so a shorter previous
+        # query may have missed commands the new one picks up
+        if len(self.last_query) <= 2 < len(query_norm):
+            return None
+        return self.last_result
+    
+    def update(self, query_norm: str, result: Tuple[int, ...]) -> None:
+        """Record the result for the query just filtered."""
+        self.last_query = query_norm
+        self.last_result = result
+
+
+_filter_state = PaletteFilterState()
+
+
+def _filter_indices(commands: List[Dict], query_norm: str,
+                    candidates: Optional[Tuple[int, ...]] = None) -> Tuple[int, ...]:
+    """Return indices of commands matching an already normalized query."""
+    fuzzy = len(query_norm) > 2
+    if candidates is None:
+        candidates = range(len(commands))
+    matches = []
+    
+    for idx in candidates:
+        command = commands[idx]
+        if query_norm in command['_haystack_norm']:
+            matches.append(idx)
+        elif fuzzy and _subseq_score(query_norm, command['_name_norm']) >= 0:
+            matches.append(idx)
+    
+    return tuple(matches)
+
+
+@lru_cache(maxsize=256)
+def _filter_cached(query_norm: str) -> Tuple[int, ...]:
+    """Memoized filter over the static command metadata."""
+    # Any match for "nepse" also matched "nep", so only rescan those
+    candidates = _filter_state.candidates(query_norm)
+    return _filter_indices(get_command_metadata(), query_norm, candidates)
 
 
 def fuzzy_filter_commands(commands: List[Dict], query: str) -> List[Dict]:
     """Filter commands using fuzzy matching."""
     if not query:
+        _filter_state.update("", ())
         return commands
     
-    query_lower = query.lower()
-    filtered = []
+    query_norm = _normalize(query)
+    # The shared metadata list never changes, so its results can be memoized
+    if commands is get_command_metadata():
+        indices = _filter_cached(query_norm)
+        _filter_state.update(query_norm, indices)
+    else:
+        indices = _filter_indices(commands, query_norm)
     
-    for command in commands:
-        haystack = f"{command['name']} {command['description']}".lower()
-        if query_lower in haystack:
-            filtered.append(command)
+    return [commands[idx] for idx in indices]
+
+
+@lru_cache(maxsize=64)
+def _build_palette_panel(filtered_key: Tuple[Tuple[str, str, str], ...],
+                         category_order_key: Tuple[str, ...]) -> Panel:
+    """Build the palette panel for a (name, description, category) listing."""
+    grouped = {category: [] for category in category_order_key}
+    for name, description, category in filtered_key:
+        grouped.setdefault(category, []).append((name, description))
+    return _render_palette_panel(grouped, category_order_key)
+
+
+@lru_cache(maxsize=None)
+def _grouped_by_category() -> Dict[str, List[Tuple[str, str]]]:
+    """Group the shared metadata into (name, description) pairs per category."""
+    return {
+        category: [(c['name'], c['description']) for c in get_command_metadata() if c['category'] == category]
+        for category in COMMAND_CATEGORY_ORDER
+    }
+
+
+def _render_palette_panel(grouped: Dict[str, List[Tuple[str, str]]],
+                          category_order: Tuple[str, ...]) -> Panel:
+    """Render already-grouped commands as the palette panel."""
+    sections = []
+    for category in category_order:
+        items = grouped.get(category) or []
+        if not items:
             continue
-        ratio = difflib.SequenceMatcher(None, query_lower, command['name'].lower()).ratio()
-        if ratio >= 0.6:
-            filtered.append(command)
-    
-    return filtered
+        header = Text(category, style="bold green")
+        table = Table.grid(expand=True)
+        table.add_column(style="bold cyan", width=20)
+        table.add_column()
+        for name, description in items:
+            table.add_row(name, description)
+        sections.extend([header, table, Text("")])
+
+    sections.append(Text("Type to search commands...", style="dim"))
+    return Panel(Group(*sections), title="Available Commands", border_style="green")
+
+
+# Unfiltered palette for the shared metadata, built on first use
+_EMPTY_QUERY_PANEL: Optional[Panel] = None
 
 
 def display_command_palette(commands: List[Dict], category_order: List[str], query: str = "") -> None:
     """Display available commands in a categorized palette."""
+    global _EMPTY_QUERY_PANEL
     original_stdout = sys.stdout
     if isinstance(sys.stdout, StdoutProxy):
         sys.stdout = sys.stdout.original_stdout
 
     try:
+        # The help screen and a bare '/' are the common case; skip filtering
+        if (not query and commands and commands is get_command_metadata()
+                and category_order == COMMAND_CATEGORY_ORDER):
+            if _EMPTY_QUERY_PANEL is None:
+                _EMPTY_QUERY_PANEL = _render_palette_panel(_grouped_by_category(), tuple(COMMAND_CATEGORY_ORDER))
+            console.print(_EMPTY_QUERY_PANEL)
+            return
+
         filtered_commands = fuzzy_filter_commands(commands, query)
         if not filtered_commands:
             message = f"No commands match '{query}'" if query else "No commands available"
             console.print(Panel(Text(message, justify="center"), title="Available Commands", border_style="red"))
             return
 
-        grouped = {category: [] for category in category_order}
-        for command in filtered_commands:
-            grouped.setdefault(command['category'], []).append(command)
-
-        sections = []
-        for category in category_order:
-            items = grouped.get(category) or []
-            if not items:
-                continue
-            header = Text(category, style="bold green")
-            table = Table.grid(expand=True)
-            table.add_column(style="bold cyan", width=20)
-            table.add_column()
-            for item in items:
-                table.add_row(item['name'], item['description'])
-            sections.extend([header, table, Text("")])
-
-        sections.append(Text("Type to search commands...", style="dim"))
-        console.print(Panel(Group(*sections), title="Available Commands", border_style="green"))
+        # Renderables are immutable once built, so identical listings reuse them
+        filtered_key = tuple((c['name'], c['description'], c['category']) for c in filtered_commands)
+        console.print(_build_palette_panel(filtered_key, tuple(category_order)))
     finally:
         sys.stdout = original_stdout
 
@@ -123,42 +259,75 @@ def display_command_palette(commands: List[Dict], category_order: List[str], que
 class NepseCommandCompleter(Completer):
     """Command completer for the NEPSE CLI."""
     
+    BUILTINS = ["exit", "quit", "help", "?"]
+    
     def __init__(self, metadata: List[Dict]):
         self.metadata = metadata
-        self.names = [m['name'] for m in metadata] + ["exit", "quit", "help", "?"]
+        self.names = [m['name'] for m in metadata] + self.BUILTINS
+        # (name, description, name_norm, description_norm), reusing the metadata keys
+        self._search_tuples = [
+            (m['name'], m.get('description', ''), m['_name_norm'], m['_desc_norm'])
+            for m in metadata
+        ]
+        self._builtins_norm = [(builtin, _normalize(builtin)) for builtin in self.BUILTINS]
+        # Completion menu labels are static, so build them once per command
+        self._formatted_cache: Dict[str, FormattedText] = {
+            name: FormattedText([
+                ("class:completion-command", f"{name:<15}"),
+                ("class:completion-description", f"  {desc}")
+            ])
+            for name, desc, _, _ in self._search_tuples
+        }
+        self._formatted_builtins: Dict[str, FormattedText] = {
+            builtin: FormattedText([
+                ("class:completion-command", f"{builtin:<15}"),
+                ("class:completion-builtin", "  Built-in command")
+            ])
+            for builtin in self.BUILTINS
+        }
+        # Sorted once so prefix lookup is a bisect instead of a full scan;
+        # matches are still yielded in metadata (category) order
+        self._sorted_names = sorted(set(self.names))
+        self._display_rank: Dict[str, int] = {}
+        for rank, name in enumerate(self.names):
+            self._display_rank.setdefault(name, rank)
 
     def get_completions(self, document, complete_event):
         text = document.text_before_cursor
         if text.startswith('/'):
-            query = text[1:].lower()
-            for cmd in self.metadata:
-                name = cmd['name']
-                desc = cmd.get('description', '')
-                if query in name.lower() or query in desc.lower():
+            raw_query = text[1:]
+            query = _normalize(raw_query)
+            # Same gate as _filter_indices, so completer and palette agree
+            fuzzy = len(query) > 2
+            for name, _, name_norm, desc_norm in self._search_tuples:
+                if (query in name_norm or query in desc_norm
+                        or (fuzzy and _subseq_score(query, name_norm) >= 0)):
                     yield Completion(
                         name,
-                        start_position=-len(query),
-                        display=FormattedText([
-                            ("class:completion-command", f"{name:<15}"),
-                            ("class:completion-description", f"  {desc}")
-                        ]),
+                        start_position=-len(raw_query),
+                        display=self._formatted_cache[name],
                     )
-            for builtin in ["exit", "quit", "help", "?"]:
-                if query in builtin:
+            for builtin, builtin_norm in self._builtins_norm:
+                if query in builtin_norm:
                     yield Completion(
                         builtin,
-                        start_position=-len(query),
-                        display=FormattedText([
-                            ("class:completion-command", f"{builtin:<15}"),
-                            ("class:completion-builtin", "  Built-in command")
-                        ]),
+                        start_position=-len(raw_query),
+                        display=self._formatted_builtins[builtin],
                     )
         else:
             word = text.split(' ')[-1]
-            for name in self.names:
-                if name.startswith(word):
-                    yield Completion(name, start_position=-len(word))
+            names = self._sorted_names
+            idx = bisect_left(names, word)
+            matches = []
+            while idx < len(names) and names[idx].startswith(word):
+                matches.append(names[idx])
+                idx += 1
+            for name in sorted(matches, key=self._display_rank.__getitem__):
+                yield Completion(name, start_position=-len(word))
+
 
+# Handled by the REPL loop itself rather than the dispatch table
+EXIT_COMMANDS = frozenset({"exit", "quit"})
 
 LEGACY_SHORTCUTS = {
     "1": "apply", "2": "add", "3": "list", "4": "portfolio", "5": "login",
@@ -180,6 +349,132 @@ def create_prompt_session(command_metadata: List[Dict]) -> PromptSession:
     )
 
 
+def _split_args(args: List[str]) -> Tuple[List[str], List[str]]:
+    """Split args into (positional_args, flag_args) in one pass."""
+    positional_args, flag_args = [], []
+    for arg in args:
+        (flag_args if arg.startswith("--") else positional_args).append(arg)
+    return positional_args, flag_args
+
+
+def _headless(flag_args: List[str]) -> bool:
+    """Browser commands run headless unless --gui is passed."""
+    return "--gui" not in flag_args
+
+
+def _keep_open(flag_args: List[str]) -> bool:
+    """With --gui, --keep-open leaves the browser up until the user closes it."""
+    return "--keep-open" in flag_args
+
+
+def _do_help(args: List[str], context: Dict) -> bool:
+    display_command_palette(context['metadata'], context['category_order'])
+    return True
+
+
+def _do_apply(args: List[str], context: Dict) -> bool:
+    positional_args, flag_args = _split_args(args)
+    member_name = positional_args[0] if positional_args else None
+    context['apply_ipo'](auto_load=True, headless=_headless(flag_args), member_name=member_name,
+                         keep_open=_keep_open(flag_args), force_login="--force-login" in flag_args)
+    return True
+
+
+def _do_apply_all(args: List[str], context: Dict) -> bool:
+    _, flag_args = _split_args(args)
+    context['apply_all'](headless=_headless(flag_args), keep_open=_keep_open(flag_args),
+                         force_login="--force-login" in flag_args, serial="--serial" in flag_args)
+    return True
+
+
+def _do_portfolio(args: List[str], context: Dict) -> bool:
+    positional_args, flag_args = _split_args(args)
+    member = None
+    if positional_args:
+        member = get_member_by_name(positional_args[0])
+        if not member:
+            print(f"\n✗ Member '{positional_args[0]}' not found.")
+            suggestions = suggest_member_names(positional_args[0])
+            if suggestions:
+                print(f"  Did you mean: {', '.join(suggestions)}?")
+    if not member:
+        member = context['select_member']()
+    if member:
+        context['portfolio'](member, headless=_headless(flag_args), refresh="--refresh" in flag_args)
+    return True
+
+
+def _do_login(args: List[str], context: Dict) -> bool:
+    _, flag_args = _split_args(args)
+    member = context['select_member']()
+    if member:
+        context['login'](member, headless=_headless(flag_args), keep_open=_keep_open(flag_args))
+    return True
+
+
+def _do_subidx(args: List[str], context: Dict) -> bool:
+    positional_args, _ = _split_args(args)
+    if positional_args:
+        subindex_name = " ".join(positional_args)
+    else:
+        print("\nAvailable sub-indices: banking, development-bank, finance, hotels-and-tourism,")
+        print("hydropower, investment, life-insurance, manufacturing-and-processing,")
+        print("microfinance, non-life-insurance, others, trading")
+        subindex_name = input("\nEnter sub-index name: ").strip()
+    if subindex_name:
+        context['cmd_subidx'](subindex_name)
+    else:
+        print("✗ Sub-index name is required.")
+    return True
+
+
+def _do_stonk(args: List[str], context: Dict) -> bool:
+    positional_args, _ = _split_args(args)
+    if positional_args:
+        # Join all positional arguments with spaces to support multiple stocks
+        symbols = " ".join(positional_args)
+    else:
+        symbols = input("\nEnter stock symbol(s) (e.g., NABIL NICA SBL): ").strip()
+    
+    if symbols:
+        context['cmd_stonk'](symbols.upper())
+    else:
+        print("✗ Stock symbol is required.")
+    return True
+
+
+def _simple_command(key: str) -> Callable[[List[str], Dict], bool]:
+    """Build a handler that just calls context[key]() with no arguments."""
+    def handler(args: List[str], context: Dict) -> bool:
+        context[key]()
+        return True
+    return handler
+
+
+# Command name -> handler(args, context)
+_DISPATCH: Dict[str, Callable[[List[str], Dict], bool]] = {
+    "help": _do_help,
+    "?": _do_help,
+    "apply": _do_apply,
+    "apply-all": _do_apply_all,
+    "add": _simple_command('add_member'),
+    "list": _simple_command('list_members'),
+    "edit": _simple_command('edit_member'),
+    "delete": _simple_command('delete_member'),
+    "manage": _simple_command('manage_members'),
+    "portfolio": _do_portfolio,
+    "login": _do_login,
+    "dp-list": _simple_command('dp_list'),
+    "dplist": _simple_command('dp_list'),
+    "ipo": _simple_command('cmd_ipo'),
+    "nepse": _simple_command('cmd_nepse'),
+    "subidx": _do_subidx,
+    "mktsum": _simple_command('cmd_mktsum'),
+    "topgl": _simple_command('cmd_topgl'),
+    "stonk": _do_stonk,
+}
+
+
 def execute_interactive_command(command: str, args: List[str], context: Dict) -> bool:
     """
     Execute an interactive command.
@@ -192,112 +487,9 @@ def execute_interactive_command(command: str, args: List[str], context: Dict) ->
     Returns:
         True if command was handled, False otherwise
     """
-    command = command.lower()
-    
-    if command in {"help", "?"}:
-        display_command_palette(context['metadata'], context['category_order'])
-        return True
-
-    flag_args = [arg for arg in args if arg.startswith("--")]
-    positional_args = [arg for arg in args if not arg.startswith("--")]
-    gui_requested = "--gui" in flag_args
-    headless = not gui_requested
-
-    if command == "apply":
-        member_name = positional_args[0] if positional_args else None
-        context['apply_ipo'](auto_load=True, headless=headless, member_name=member_name)
-        return True
-    
-    if command == "apply-all":
-        context['apply_all'](headless=headless)
-        return True
-    
-    if command == "add":
-        context['add_member']()
-        return True
-    
-    if command == "list":
-        context['list_members']()
-        return True
-    
-    if command == "edit":
-        context['edit_member']()
-        return True
-    
-    if command == "delete":
-        context['delete_member']()
-        return True
-    
-    if command == "manage":
-        context['manage_members']()
-        return True
-    
-    if command == "portfolio":
-        member = None
-        if positional_args:
-            member = get_member_by_name(positional_args[0])
-            if not member:
-                print(f"\n✗ Member '{positional_args[0]}' not found.")
-        if not member:
-            member = context['select_member']()
-        if member:
-            context['portfolio'](member, headless=headless)
-        return True
-    
-    if command == "login":
-        member = context['select_member']()
-        if member:
-            context['login'](member, headless=headless)
-        return True
-    
-    if command in {"dp-list", "dplist"}:
-        context['dp_list']()
-        return True
-    
-    if command == "ipo":
-        context['cmd_ipo']()
-        return True
-    
-    if command == "nepse":
-        context['cmd_nepse']()
-        return True
-    
-    if command == "subidx":
-        if positional_args:
-            subindex_name = " ".join(positional_args)
-        else:
-            print("\nAvailable sub-indices: banking, development-bank, finance, hotels-and-tourism,")
-            print("hydropower, investment, life-insurance, manufacturing-and-processing,")
-            print("microfinance, non-life-insurance, others, trading")
-            subindex_name = input("\nEnter sub-index name: ").strip()
-        if subindex_name:
-            context['cmd_subidx'](subindex_name)
-        else:
-            print("✗ Sub-index name is required.")
-        return True
-    
-    if command == "mktsum":
-        context['cmd_mktsum']()
-        return True
-    
-    if command == "topgl":
-        context['cmd_topgl']()
-        return True
-    
-    if command == "stonk":
-        if positional_args:
-            # Join all positional arguments with spaces to support multiple stocks
-            symbols = " ".join(positional_args)
-        else:
-            symbols = input("\nEnter stock symbol(s) (e.g., NABIL NICA SBL): ").strip()
-        
-        if symbols:
-            context['cmd_stonk'](symbols.upper())
-        else:
-            print("✗ Stock symbol is required.")
-        return True
-    
-    if command in {"exit", "quit"}:
+    handler = _DISPATCH.get(command.casefold())
+    if handler is None:
+        # Includes exit/quit, which the caller handles
         return False
-    
-    return False
+
+    return handler(args, context)
@@ -2,6 +2,8 @@
 Console styling and display utilities.
 """
 
+import sys
+
 from colorama import init as colorama_init
 from prompt_toolkit.styles import Style as PTStyle
 from prompt_toolkit.formatted_text import FormattedText
@@ -9,8 +11,9 @@ from prompt_toolkit.formatted_text import FormattedText
 from rich.console import Console
 from rich import box
 
-# Initialize colorama
-colorama_init(autoreset=True)
+# Initialize colorama (only Windows consoles need ANSI translation)
+if sys.platform == "win32":
+    colorama_init(autoreset=True)
 
 # Global console instance
 console = Console(force_terminal=True, legacy_windows=False)
@@ -35,18 +38,24 @@ CLI_PROMPT_STYLE = PTStyle.from_dict({
 })
 
 
+_LOGO_LINES = [
+    " ███╗   ██╗███████╗██████╗ ███████╗███████╗      ██████╗██╗     ██╗",
+    " ████╗  ██║██╔════╝██╔══██╗██╔════╝██╔════╝     ██╔════╝██║     ██║",
+    " ██╔██╗ ██║█████╗  ██████╔╝███████╗█████╗ █████╗██║     ██║     ██║",
+    " ██║╚██╗██║██╔══╝  ██╔═══╝ ╚════██║██╔══╝ ╚════╝██║     ██║     ██║",
+    " ██║ ╚████║███████╗██║     ███████║███████╗     ╚██████╗███████╗██║",
+    " ╚═╝  ╚═══╝╚══════╝╚═╝     ╚══════╝╚══════╝      ╚═════╝╚══════╝╚═╝",
+]
+_LOGO_COLORS = [(0, 255, 0), (0, 230, 0), (0, 204, 0), (0, 179, 0), (0, 153, 0), (0, 128, 0)]
+
+# Gradient logo with ANSI escapes applied, built once at import
+_LOGO_STR = "\n\n" + "\n".join(
+    f"\033[38;2;{r};{g};{b}m{line}\033[0m"
+    for (r, g, b), line in zip(_LOGO_COLORS, _LOGO_LINES)
+) + "\n"
+
+
 def print_logo() -> None:
     """Render the gradient welcome logo when interactive mode launches."""
-    print("\n")
-    logo_lines = [
-        " ███╗   ██╗███████╗██████╗ ███████╗███████╗      ██████╗██╗     ██╗",
-        " ████╗  ██║██╔════╝██╔══██╗██╔════╝██╔════╝     ██╔════╝██║     ██║",
-        " ██╔██╗ ██║█████╗  ██████╔╝███████╗█████╗ █████╗██║     ██║     ██║",
-        " ██║╚██╗██║██╔══╝  ██╔═══╝ ╚════██║██╔══╝ ╚════╝██║     ██║     ██║",
-        " ██║ ╚████║███████╗██║     ███████║███████╗     ╚██████╗███████╗██║",
-        " ╚═╝  ╚═══╝╚══════╝╚═╝     ╚══════╝╚══════╝      ╚═════╝╚══════╝╚═╝",
-    ]
-    colors = [(0, 255, 0), (0, 230, 0), (0, 204, 0), (0, 179, 0), (0, 153, 0), (0, 128, 0)]
-    for idx, line in enumerate(logo_lines):
-        r, g, b = colors[idx]
-        print(f"\033[38;2;{r};{g};{b}m{line}\033[0m")
+    sys.stdout.write(_LOGO_STR)
+    sys.stdout.flush()
@@ -3,6 +3,7 @@ Member management UI components.
 Family member CRUD operations with Rich UI.
 """
 
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 from prompt_toolkit.application import Application
@@ -23,12 +24,89 @@ from ..config import (
     load_family_members, 
     save_family_members,
     get_all_members,
+    get_member_index,
+    suggest_member_names,
     add_member as config_add_member,
     delete_member as config_delete_member
 )
 
 console = Console(force_terminal=True, legacy_windows=False)
 
+# Single-choice menus (member picker, manage menu) share one Application;
+# each call just swaps in its title and lines
+_select_state = {"title": "", "lines": [], "index": 0}
+
+_SELECT_BINDINGS = KeyBindings()
+
+
+@_SELECT_BINDINGS.add('up')
+def _(event):
+    _select_state["index"] = (_select_state["index"] - 1) % len(_select_state["lines"])
+
+
+@_SELECT_BINDINGS.add('down')
+def _(event):
+    _select_state["index"] = (_select_state["index"] + 1) % len(_select_state["lines"])
+
+
+@_SELECT_BINDINGS.add('enter')
+def _(event):
+    event.app.exit(result=_select_state["index"])
+
+
+@_SELECT_BINDINGS.add('c-c')
+def _(event):
+    event.app.exit(result=None)
+
+
+_SELECT_STYLE = PTStyle.from_dict({
+    'selected': 'fg:ansigreen bold',
+    'unselected': '',
+    'title': 'bold underline'
+})
+
+_select_app: Optional[Application] = None
+
+
+def _select_formatted_text() -> FormattedText:
+    result = [('class:title', _select_state["title"])]
+    for i, line in enumerate(_select_state["lines"]):
+        if i == _select_state["index"]:
+            result.append(('class:selected', f' > {line}\n'))
+        else:
+            result.append(('class:unselected', f'   {line}\n'))
+    return FormattedText(result)
+
+
+def _select_height() -> int:
+    return len(_select_state["lines"]) + _select_state["title"].count('\n') + 1
+
+
+def _run_select_menu(title: str, lines: List[str]) -> Optional[int]:
+    """
+    Show an arrow-key menu and return the chosen index.
+    
+    Args:
+        title: Title line(s), including trailing newlines
+        lines: One entry per option
+        
+    Returns:
+        Selected index, or None if cancelled with Ctrl+C
+    """
+    global _select_app
+    _select_state.update(title=title, lines=lines, index=0)
+    if _select_app is None:
+        _select_app = Application(
+            layout=Layout(
+                Window(content=FormattedTextControl(_select_formatted_text), height=_select_height)
+            ),
+            key_bindings=_SELECT_BINDINGS,
+            style=_SELECT_STYLE,
+            full_screen=False,
+            mouse_support=False
+        )
+    return _select_app.run()
+
 
 def select_member_interactive(
     title: str = "Select Family Member", 
@@ -54,56 +132,12 @@ def select_member_interactive(
         ))
         return None, None
     
-    selected_index = 0
-    
-    bindings = KeyBindings()
-
-    @bindings.add('up')
-    def _(event):
-        nonlocal selected_index
-        selected_index = (selected_index - 1) % len(members)
-
-    @bindings.add('down')
-    def _(event):
-        nonlocal selected_index
-        selected_index = (selected_index + 1) % len(members)
-
-    @bindings.add('enter')
-    def _(event):
-        event.app.exit(result=(members[selected_index], selected_index))
-
-    @bindings.add('c-c')
-    def _(event):
-        event.app.exit(result=(None, None))
-
-    def get_formatted_text():
-        result = []
-        result.append(('class:title', f'{title} (Use ↑/↓ and Enter):\n'))
-        for i, member in enumerate(members):
-            if i == selected_index:
-                result.append(('class:selected', f' > {member["name"]} (DP: {member["dp_value"]})\n'))
-            else:
-                result.append(('class:unselected', f'   {member["name"]} (DP: {member["dp_value"]})\n'))
-        return FormattedText(result)
-
-    style = PTStyle.from_dict({
-        'selected': 'fg:ansigreen bold',
-        'unselected': '',
-        'title': 'bold underline'
-    })
-
-    app = Application(
-        layout=Layout(
-            Window(content=FormattedTextControl(get_formatted_text), height=len(members) + 2)
-        ),
-        key_bindings=bindings,
-        style=style,
-        full_screen=False,
-        mouse_support=False
-    )
-
     try:
-        selected, index = app.run()
+        index = _run_select_menu(
+            f'{title} (Use ↑/↓ and Enter):\n',
+            [f'{member["name"]} (DP: {member["dp_value"]})' for member in members]
+        )
+        selected = members[index] if index is not None else None
         
         if selected and show_details:
             console.print(f"[bold green]✓ Selected:[/bold green] {selected['name']} (Kitta: {selected['applied_kitta']} | CRN: {selected['crn_number']})")
@@ -175,16 +209,29 @@ def select_members_for_ipo(members: List[Dict]) -> List[Dict]:
     def _(event):
         event.app.exit(result=None)
     
+    # Row text never changes while the menu is open; only checkbox and style do
+    member_rows = [
+        f"{member['name']:<15} | Kitta: {member['applied_kitta']:<4} | CRN: {member['crn_number']}"
+        for member in members
+    ]
+    header = [
+        ('class:title', '╔════════════════════════════════════════════════════════════════════╗\n'),
+        ('class:title', '║  Select Members for IPO Application                                ║\n'),
+        ('class:title', '╚════════════════════════════════════════════════════════════════════╝\n'),
+        ('class:help', '  Controls: [↑/↓] Navigate | [Space] Toggle | [A] All/None | [Enter] Confirm\n\n'),
+    ]
+    # Redraws without a key change (resize, cursor blink) reuse the last render
+    rendered = {"key": None, "text": None}
+    
     def get_formatted_text():
-        result = []
-        result.append(('class:title', '╔════════════════════════════════════════════════════════════════════╗\n'))
-        result.append(('class:title', '║  Select Members for IPO Application                                ║\n'))
-        result.append(('class:title', '╚════════════════════════════════════════════════════════════════════╝\n'))
-        result.append(('class:help', '  Controls: [↑/↓] Navigate | [Space] Toggle | [A] All/None | [Enter] Confirm\n\n'))
+        key = (current_index, tuple(selected))
+        if rendered["key"] == key:
+            return rendered["text"]
+        
+        result = list(header)
         
-        for i, member in enumerate(members):
+        for i, member_info in enumerate(member_rows):
             checkbox = '[X]' if selected[i] else '[ ]'
-            member_info = f"{member['name']:<15} | Kitta: {member['applied_kitta']:<4} | CRN: {member['crn_number']}"
             
             if i == current_index:
                 if selected[i]:
@@ -201,7 +248,9 @@ def select_members_for_ipo(members: List[Dict]) -> List[Dict]:
         result.append(('class:separator', '\n  ──────────────────────────────────────────────────────────\n'))
         result.append(('class:footer', f'  Selected: {selected_count}/{len(members)} members'))
         
-        return FormattedText(result)
+        rendered["key"] = key
+        rendered["text"] = FormattedText(result)
+        return rendered["text"]
     
     style = PTStyle.from_dict({
         'title': 'bold cyan',
@@ -245,6 +294,25 @@ def select_members_for_ipo(members: List[Dict]) -> List[Dict]:
         return []
 
 
+COMMON_DPS = (
+    ("139", "CREATIVE SECURITIES PRIVATE LIMITED"),
+    ("146", "GLOBAL IME CAPITAL LIMITED"),
+    ("175", "NMB CAPITAL LIMITED"),
+    ("190", "SIDDHARTHA CAPITAL LIMITED"),
+)
+
+
+@lru_cache(maxsize=None)
+def _common_dp_table() -> Table:
+    """Build the static 'Common DPs' hint table once."""
+    dp_table = Table(title="Common DPs", box=box.SIMPLE, show_header=True, header_style="bold magenta")
+    dp_table.add_column("DP Code", style="cyan", justify="center")
+    dp_table.add_column("Name", style="white")
+    for dp_code, dp_name in COMMON_DPS:
+        dp_table.add_row(dp_code, dp_name)
+    return dp_table
+
+
 def add_family_member() -> None:
     """Add a new family member with enhanced UI."""
     console.print("\n")
@@ -267,27 +335,28 @@ def add_family_member() -> None:
         return
     
     # Check if exists
-    for member in config.get('members', []):
-        if member['name'].lower() == member_name.lower():
-            console.print(f"\n[yellow]⚠ Member '{member_name}' already exists![/yellow]")
-            update = Prompt.ask("[cyan]Update this member?[/cyan]", choices=["yes", "no"], default="no")
-            if update != 'yes':
+    existing_idx = get_member_index(member_name)
+    if existing_idx is not None:
+        console.print(f"\n[yellow]⚠ Member '{member_name}' already exists![/yellow]")
+        update = Prompt.ask("[cyan]Update this member?[/cyan]", choices=["yes", "no"], default="no")
+        if update != 'yes':
+            console.print("[yellow]✗ Cancelled[/yellow]")
+            return
+        config['members'].pop(existing_idx)
+    else:
+        # Catch near-duplicates like "dad " vs "Dad" or "Mum" vs "Mom"
+        similar = suggest_member_names(member_name, limit=1)
+        if similar:
+            console.print(f"\n[yellow]⚠ Did you mean '{similar[0]}'? A similar member already exists.[/yellow]")
+            proceed = Prompt.ask(f"[cyan]Add '{member_name}' as a new member anyway?[/cyan]", choices=["yes", "no"], default="yes")
+            if proceed != 'yes':
                 console.print("[yellow]✗ Cancelled[/yellow]")
                 return
-            config['members'].remove(member)
-            break
     
     # Credentials
     console.print("\n[bold yellow]🔐 Meroshare Credentials[/bold yellow]")
     
-    dp_table = Table(title="Common DPs", box=box.SIMPLE, show_header=True, header_style="bold magenta")
-    dp_table.add_column("DP Code", style="cyan", justify="center")
-    dp_table.add_column("Name", style="white")
-    dp_table.add_row("139", "CREATIVE SECURITIES PRIVATE LIMITED")
-    dp_table.add_row("146", "GLOBAL IME CAPITAL LIMITED")
-    dp_table.add_row("175", "NMB CAPITAL LIMITED")
-    dp_table.add_row("190", "SIDDHARTHA CAPITAL LIMITED")
-    console.print(dp_table)
+    console.print(_common_dp_table())
     console.print("[dim]Type 'dplist' command to see all DPs[/dim]\n")
     
     dp_value = Prompt.ask("[cyan]DP value[/cyan] (e.g., 139)").strip()
@@ -328,19 +397,9 @@ def add_family_member() -> None:
     console.print("")
 
 
-def list_family_members() -> Optional[List[Dict]]:
-    """List all family members with enhanced UI."""
-    members = get_all_members()
-    
-    if not members:
-        console.print(Panel(
-            "[bold red]⚠ No family members found.[/bold red]\n"
-            "[yellow]Use 'add' command to add members first![/yellow]",
-            box=box.ROUNDED,
-            border_style="red"
-        ))
-        return None
-    
+@lru_cache(maxsize=4)
+def _render_members_table(members_key: Tuple[Tuple[str, str, str, str, str], ...]) -> Table:
+    """Build the members table for ((name, username, dp, kitta, crn), ...)."""
     table = Table(
         title="[bold cyan]👥 Family Members[/bold cyan]",
         box=box.ROUNDED,
@@ -355,18 +414,34 @@ def list_family_members() -> Optional[List[Dict]]:
     table.add_column("Kitta", justify="right", style="green")
     table.add_column("CRN", style="yellow")
 
-    for idx, member in enumerate(members, 1):
-        table.add_row(
-            str(idx),
-            f"[bold]{member['name']}[/bold]",
-            member['username'],
-            member['dp_value'],
-            str(member['applied_kitta']),
-            member['crn_number']
-        )
+    for idx, (name, username, dp_value, kitta, crn) in enumerate(members_key, 1):
+        table.add_row(str(idx), f"[bold]{name}[/bold]", username, dp_value, kitta, crn)
+    
+    return table
+
+
+def list_family_members() -> Optional[List[Dict]]:
+    """List all family members with enhanced UI."""
+    members = get_all_members()
+    
+    if not members:
+        console.print(Panel(
+            "[bold red]⚠ No family members found.[/bold red]\n"
+            "[yellow]Use 'add' command to add members first![/yellow]",
+            box=box.ROUNDED,
+            border_style="red"
+        ))
+        return None
+    
+    # Unchanged member lists reuse the table built last time
+    members_key = tuple(
+        (member['name'], member['username'], member['dp_value'],
+         str(member['applied_kitta']), member['crn_number'])
+        for member in members
+    )
     
     console.print("\n")
-    console.print(table)
+    console.print(_render_members_table(members_key))
     console.print(f"\n[dim]Total: {len(members)} member(s)[/dim]")
     return members
 
@@ -536,55 +611,11 @@ def manage_family_members() -> None:
             padding=(0, 2)
         ))
         
-        selected_index = 0
-        bindings = KeyBindings()
-
-        @bindings.add('up')
-        def _(event):
-            nonlocal selected_index
-            selected_index = (selected_index - 1) % len(menu_options)
-
-        @bindings.add('down')
-        def _(event):
-            nonlocal selected_index
-            selected_index = (selected_index + 1) % len(menu_options)
-
-        @bindings.add('enter')
-        def _(event):
-            event.app.exit(result=selected_index)
-
-        @bindings.add('c-c')
-        def _(event):
-            event.app.exit(result=None)
-
-        def get_formatted_text():
-            result = []
-            result.append(('class:title', 'Select an option (Use ↑/↓ and Enter):\n\n'))
-            for i, (num, desc, _) in enumerate(menu_options):
-                if i == selected_index:
-                    result.append(('class:selected', f' > {desc}\n'))
-                else:
-                    result.append(('class:unselected', f'   {desc}\n'))
-            return FormattedText(result)
-
-        style = PTStyle.from_dict({
-            'selected': 'fg:ansigreen bold',
-            'unselected': '',
-            'title': 'bold underline'
-        })
-
-        app = Application(
-            layout=Layout(
-                Window(content=FormattedTextControl(get_formatted_text), height=len(menu_options) + 3)
-            ),
-            key_bindings=bindings,
-            style=style,
-            full_screen=False,
-            mouse_support=False
-        )
-
         try:
-            choice_index = app.run()
+            choice_index = _run_select_menu(
+                'Select an option (Use ↑/↓ and Enter):\n\n',
+                [desc for _, desc, _ in menu_options]
+            )
             
             if choice_index is None or choice_index == 4:
                 break
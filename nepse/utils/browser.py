@@ -2,32 +2,82 @@
 Browser utility functions for Playwright.
 """
 
+import os
 import sys
 import subprocess
+from pathlib import Path
+from typing import Optional
+
+from ..config import PLAYWRIGHT_SENTINEL_FILE
+
+
+def _playwright_version() -> Optional[str]:
+    """Return the installed Playwright package version, if available."""
+    try:
+        from importlib.metadata import version
+        return version("playwright")
+    except ImportError:
+        pass  # Python 3.7: no importlib.metadata
+    except Exception:
+        return None
+    try:
+        import pkg_resources
+        return pkg_resources.get_distribution("playwright").version
+    except Exception:
+        return None
+
+
+def _browsers_path() -> Optional[Path]:
+    """Return the directory Playwright downloads browsers into."""
+    custom = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+    if custom:
+        # "0" means browsers live inside the package; no cheap check for that
+        return None if custom == "0" else Path(custom)
+    if sys.platform == "win32":
+        return Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")) / "ms-playwright"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "ms-playwright"
+    return Path.home() / ".cache" / "ms-playwright"
+
+
+def _chromium_present() -> bool:
+    """Check for a downloaded chromium build without launching it."""
+    path = _browsers_path()
+    return bool(path and path.is_dir() and any(path.glob("chromium-*")))
 
 
 def ensure_playwright_browsers() -> None:
     """Ensure Playwright browsers are installed, install if missing."""
+    pw_version = _playwright_version()
+    
+    # Fast path: this Playwright version was already verified and chromium is on disk
     try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True, timeout=5000)
-            browser.close()
-    except Exception:
+        verified = PLAYWRIGHT_SENTINEL_FILE.read_text(encoding="utf-8").strip()
+    except OSError:
+        verified = None
+    if pw_version and verified == pw_version and _chromium_present():
+        return
+    
+    missing = not _chromium_present()
+    if missing:
         print("[yellow]⚠️  Playwright browsers not found. Installing chromium...[/yellow]")
-        try:
-            result = subprocess.run(
-                [sys.executable, "-m", "playwright", "install", "chromium"],
-                capture_output=True,
-                text=True,
-                timeout=300
-            )
-            if result.returncode == 0:
+    try:
+        # Idempotent: only downloads when the build for this version is missing
+        result = subprocess.run(
+            [sys.executable, "-m", "playwright", "install", "chromium"],
+            capture_output=True,
+            text=True,
+            timeout=300
+        )
+        if result.returncode == 0:
+            if missing:
                 print("[green]✓ Browsers installed successfully![/green]")
-            else:
-                print(f"[red]✗ Failed to install browsers: {result.stderr}[/red]")
-                print("[yellow]You can install manually with: playwright install chromium[/yellow]")
-        except subprocess.TimeoutExpired:
-            print("[red]✗ Browser installation timed out. Please install manually.[/red]")
-        except Exception as e:
-            print(f"[red]✗ Error installing browsers: {e}[/red]")
+            if pw_version:
+                PLAYWRIGHT_SENTINEL_FILE.write_text(pw_version, encoding="utf-8")
+        else:
+            print(f"[red]✗ Failed to install browsers: {result.stderr}[/red]")
+            print("[yellow]You can install manually with: playwright install chromium[/yellow]")
+    except subprocess.TimeoutExpired:
+        print("[red]✗ Browser installation timed out. Please install manually.[/red]")
+    except Exception as e:
+        print(f"[red]✗ Error installing browsers: {e}[/red]")
@@ -2,6 +2,14 @@
 Formatting utilities for numbers and currency.
 """
 
+# Thousands separators and stray spaces removed before parsing numeric strings
+_NUM_STRIP = str.maketrans('', '', ', ')
+
+
+def _to_float(value) -> float:
+    """Parse a number that may be given as a comma-grouped string."""
+    return float(str(value).translate(_NUM_STRIP))
+
 
 def format_number(num) -> str:
     """
@@ -15,7 +23,7 @@ def format_number(num) -> str:
         Formatted string
     """
     try:
-        num = float(str(num).replace(',', ''))
+        num = _to_float(num)
         
         # For whole numbers, don't show decimal places
         if num == int(num):
@@ -37,7 +45,7 @@ def format_number_compact(num) -> str:
         Formatted string with suffix
     """
     try:
-        num = float(str(num).replace(',', ''))
+        num = _to_float(num)
         if num >= 1_000_000_000:
             return f"{num / 1_000_000_000:.2f}B"
         elif num >= 1_000_000:
@@ -62,7 +70,7 @@ def format_rupees(amount) -> str:
         Formatted rupee string
     """
     try:
-        amount = float(str(amount).replace(',', ''))
+        amount = _to_float(amount)
         
         # For display in tables, use standard comma formatting
         # Remove decimal places if the amount is a whole number
@@ -86,7 +94,7 @@ def format_indian_rupees(amount) -> str:
         Formatted string in Indian style
     """
     try:
-        amount = float(str(amount).replace(',', ''))
+        amount = _to_float(amount)
         
         # Convert to integer if it's a whole number
         if amount == int(amount):
@@ -152,8 +160,8 @@ def format_change(current, previous) -> str:
         Formatted change string with +/- and percentage
     """
     try:
-        current = float(str(current).replace(',', ''))
-        previous = float(str(previous).replace(',', ''))
+        current = _to_float(current)
+        previous = _to_float(previous)
         
         if previous == 0:
             return "N/A"
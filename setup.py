@@ -16,11 +16,13 @@ setup(
         "rich>=13.0.0",
         "colorama>=0.4.6",
         "requests>=2.25.0",
-        "beautifulsoup4>=4.9.0",
         "cloudscraper>=1.2.0",
         "tenacity>=9.0.0",
         "lxml>=4.9.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.9.0", "rapidfuzz>=3.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "nepse=nepse_cli:main",
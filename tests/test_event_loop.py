@@ -0,0 +1,46 @@
+"""
+Regression test: a pooled Playwright call must not break the next prompt.
+
+Sync Playwright leaves its event loop registered as the thread's running
+loop, and prompt_toolkit's Application.run() uses asyncio.run(), which
+refuses to start inside a running loop.
+"""
+
+import pytest
+
+pytest.importorskip("playwright.sync_api")
+
+from prompt_toolkit.application import Application
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.output import DummyOutput
+
+from nepse.core import auth
+
+
+def _run_prompt_app():
+    with create_pipe_input() as pipe_input:
+        app = Application(input=pipe_input, output=DummyOutput())
+        return app.run(pre_run=lambda: app.exit(result="done"))
+
+
+@pytest.fixture
+def pooled_playwright(monkeypatch):
+    # The driver alone is enough; don't download Chromium for this test
+    monkeypatch.setattr(auth, "ensure_playwright_browsers", lambda: None)
+    yield auth.get_playwright
+    auth.shutdown_playwright()
+
+
+def test_prompt_runs_after_playwright_call(pooled_playwright):
+    request_context = pooled_playwright().request.new_context()
+    request_context.dispose()
+
+    auth.release_event_loop()
+    assert _run_prompt_app() == "done"
+
+    # The parked loop comes back for the next browser command
+    request_context = pooled_playwright().request.new_context()
+    request_context.dispose()
+
+    auth.release_event_loop()
+    assert _run_prompt_app() == "done"